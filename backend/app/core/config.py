@@ -1,10 +1,15 @@
-
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
      # MongoDB Configuration
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "library_management_db"
+    MONGODB_MAX_POOL_SIZE: int = 200
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_MAX_IDLE_TIME_MS: int = 300_000
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
     
     # JWT Configuration
     SECRET_KEY: str = "your-super-secret-jwt-key-change-in-production-min-32-characters"
@@ -12,6 +17,12 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Authenticated user cache, kept per worker process: a profile change,
+    # deactivation or logout handled by one worker reaches the others only
+    # when their entry expires, so keep the TTL to a few seconds
+    USER_CACHE_TTL_SECONDS: int = 5
+    USER_CACHE_MAX_SIZE: int = 10_000
+    
     # OTP Configuration
     STATIC_OTP: str = "123456"  # Static OTP for testing
     OTP_EXPIRE_MINUTES: int = 10
@@ -27,11 +38,21 @@ class Settings(BaseSettings):
     LENDING_DURATION_OPTIONS: list = [5, 8]
     MAX_ADVANCE_BOOKING_DAYS: int = 90
     
+    # Book search: weighted $text index instead of word-prefix regex
+    BOOK_TEXT_SEARCH: bool = False
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
-        extra="ignore"
+        extra="ignore",
+        frozen=True
     )
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once; later calls reuse the parsed instance."""
+    return Settings()
+
+
+settings = get_settings()
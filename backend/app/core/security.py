@@ -1,10 +1,18 @@
 from datetime import datetime, timedelta
+from time import time
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+import orjson
+from jose import jws, jwt
+from jose.exceptions import JOSEError
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.utils.time_utils import utc_now
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Values of the "type" claim
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -17,14 +25,14 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = utc_now() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = utc_now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
-        "type": "access"
+        "iat": utc_now(),
+        "type": ACCESS_TOKEN_TYPE
     })
     
     encoded_jwt = jwt.encode(
@@ -41,14 +49,14 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = utc_now() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = utc_now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
-        "type": "refresh"
+        "iat": utc_now(),
+        "type": REFRESH_TOKEN_TYPE
     })
     
     encoded_jwt = jwt.encode(
@@ -61,16 +69,34 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a token's signature and expiry and return its claims.
     
+    Verifies with jws.verify and parses the claims with orjson, checking
+    exp by hand. jwt.decode would re-parse with the stdlib json module and
+    run claim checks (aud, iss, nbf, ...) these tokens never carry.
+    """
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        return payload
-    except JWTError:
+        payload = orjson.loads(jws.verify(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]))
+    except (JOSEError, orjson.JSONDecodeError):
+        return None
+    
+    if not isinstance(payload, dict):
+        return None
+    
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time():
+        return None
+    
+    return payload
+
+
+def decode_and_check_type(token: str, expected_type: str) -> Optional[Dict[str, Any]]:
+    """Decode and verify a token once; None if invalid, expired or of another type."""
+    payload = decode_token(token)
+    if not payload or payload.get("type") != expected_type:
         return None
+    return payload
 
 
 def get_token_expiry(token: str) -> Optional[datetime]:
@@ -80,11 +106,3 @@ def get_token_expiry(token: str) -> Optional[datetime]:
         return datetime.fromtimestamp(payload["exp"])
     return None
 
-
-def verify_token_type(token: str, expected_type: str) -> bool:
-    
-    payload = decode_token(token)
-    if not payload:
-        return False
-    
-    return payload.get("type") == expected_type
\ No newline at end of file
@@ -1,6 +1,11 @@
+import asyncio
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 class MongoDB:
     """MongoDB connection manager."""
     client: AsyncIOMotorClient = None
@@ -8,6 +13,9 @@ class MongoDB:
 
 mongodb = MongoDB()
 
+# Oldest server the queries run on: OTP verification uses a pipeline-style update
+MIN_SERVER_VERSION = (4, 2)
+
 async def connect_to_mongo():
     """Initialize MongoDB connection and create indexes."""
     try:
@@ -17,9 +25,11 @@ async def connect_to_mongo():
         
         mongodb.client = AsyncIOMotorClient(
             settings.MONGODB_URL,
-            maxPoolSize=10,
-            minPoolSize=1,
-            serverSelectionTimeoutMS=5000,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
         )
         
         mongodb.database = mongodb.client[settings.DATABASE_NAME]
@@ -28,7 +38,19 @@ async def connect_to_mongo():
         await mongodb.client.admin.command('ping')
         print(f"Connected to MongoDB: {settings.DATABASE_NAME}\n")
         
+        # Refuse to start rather than fail on the first request that needs it
+        server_info = await mongodb.client.server_info()
+        if tuple(server_info["versionArray"][:2]) < MIN_SERVER_VERSION:
+            raise RuntimeError(
+                f"MongoDB {server_info['version']} is too old; "
+                f"{'.'.join(map(str, MIN_SERVER_VERSION))} or later is required"
+            )
+        
+        # Warm up the pool so the first requests don't pay the handshake cost
+        await warm_up_pool()
+        
         # Create indexes
+        await drop_legacy_indexes()
         await create_indexes()
         print(f"Database indexes created\n")
     
@@ -39,51 +61,140 @@ async def connect_to_mongo():
         # Don't set to None, raise the error so app doesn't start
         raise RuntimeError(f"MongoDB connection failed: {e}")
 
+async def warm_up_pool():
+    """Open pooled connections up front with a cheap parallel fan-out."""
+    await asyncio.gather(*(
+        mongodb.database[name].estimated_document_count()
+        for name in ("users", "books", "lendings", "otps", "refresh_tokens")
+    ))
+
 async def close_mongo_connection():
     """Close MongoDB connection."""
     if mongodb.client:
         mongodb.client.close()
         print("MongoDB connection closed")
 
-async def create_indexes():
-# Users collection
-    await mongodb.database.users.create_index("email", unique=True)
-    await mongodb.database.users.create_index("is_verified")
-    
-    # Books collection
-    await mongodb.database.books.create_index([
-        ("title", "text"),
-        ("author", "text"),
-        ("genre", "text")
-    ])
-    await mongodb.database.books.create_index("genre")
+# Indexes created by earlier releases that are now unused or covered by compound indexes
+LEGACY_INDEXES = {
+    "users": [
+        "is_verified_1",
+    ],
+    "books": [
+        "title_text_author_text_genre_text",
+        "title_1",
+        "author_1",
+        "genre_1",
+    ],
+    "lendings": [
+        "user_id_1",
+        "book_id_1",
+        "status_1",
+        "lend_end_date_1",
+        "user_id_1_status_1",
+        "user_id_1_status_1_lend_end_date_1",
+        "book_id_1_status_1_lend_end_date_1",
+    ],
+    "otps": [
+        "email_1",
+        "purpose_1",
+        "expires_at_1",
+        "email_1_purpose_1_is_used_1",
+    ],
+    "refresh_tokens": [
+        "user_id_1",
+        "expires_at_1",
+        "is_revoked_1",
+        "user_id_1_is_revoked_1",
+        "token_hash_1",
+    ],
+}
+
+async def _drop_index(collection, name: str):
+    """Drop one index, ignoring indexes that are already gone."""
+    try:
+        await collection.drop_index(name)
+        print(f"   Dropped legacy index {name} on {collection.name}")
+    except OperationFailure:
+        pass
+
+async def drop_legacy_indexes():
+    """Remove superseded indexes so writes stop maintaining them."""
+    db = mongodb.database
+    await asyncio.gather(*(
+        _drop_index(db[collection], name)
+        for collection, names in LEGACY_INDEXES.items()
+        for name in names
+    ))
+
+async def _create_index(collection, keys, **kwargs):
+    """
+    Build one index, skipping it if it conflicts with an existing index.
     
-    # Lendings collection
-    await mongodb.database.lendings.create_index("user_id")
-    await mongodb.database.lendings.create_index("book_id")
-    await mongodb.database.lendings.create_index("status")
-    await mongodb.database.lendings.create_index("lend_end_date")
-    await mongodb.database.lendings.create_index([("user_id", 1), ("status", 1)])
+    Unique and partial indexes back correctness guarantees (unique emails,
+    one live refresh token per hash), so a conflict on those stops startup.
+    """
+    try:
+        await collection.create_index(keys, background=True, **kwargs)
+    except OperationFailure:
+        if kwargs.get("unique") or "partialFilterExpression" in kwargs:
+            logger.error("Could not create required index %s on %s", keys, collection.name)
+            raise
+        logger.warning("Skipping index %s on %s", keys, collection.name, exc_info=True)
+
+async def create_indexes():
+    """Create all collection indexes concurrently."""
+    db = mongodb.database
     
-    # OTPs collection (NEW)
-    await mongodb.database.otps.create_index("email")
-    await mongodb.database.otps.create_index("purpose")
-    await mongodb.database.otps.create_index("expires_at")
-    await mongodb.database.otps.create_index([
-        ("email", 1),
-        ("purpose", 1),
-        ("is_used", 1)
-    ])
+    await asyncio.gather(
+        # Users collection
+        _create_index(db.users, "email", unique=True),
+        
+        # Lendings collection (equality, equality, sort/range)
+        _create_index(
+            db.lendings,
+            [("user_id", 1), ("status", 1), ("lend_end_date", 1)],
+            name="user_status_enddate"
+        ),
+        _create_index(
+            db.lendings,
+            [("book_id", 1), ("status", 1), ("lend_end_date", 1)],
+            name="book_status_enddate"
+        ),
+        
+        # OTPs collection (the TTL monitor purges expired documents about
+        # once a minute, so there is no cleanup job)
+        _create_index(db.otps, "expires_at", expireAfterSeconds=0, name="expires_at_ttl"),
+        _create_index(
+            db.otps,
+            [("email", 1), ("purpose", 1), ("is_used", 1)],
+            partialFilterExpression={"is_used": False},
+            name="live_otp_lookup"
+        ),
+        
+        # Refresh tokens collection
+        _create_index(
+            db.refresh_tokens,
+            "token_hash",
+            unique=True,
+            partialFilterExpression={"is_revoked": False},
+            name="live_token_hash"
+        ),
+        _create_index(db.refresh_tokens, "expires_at", expireAfterSeconds=0, name="expires_at_ttl"),
+        _create_index(
+            db.refresh_tokens,
+            [("user_id", 1), ("is_revoked", 1)],
+            partialFilterExpression={"is_revoked": False},
+            name="live_user_tokens"
+        ),
+    )
     
-    # Refresh tokens collection (NEW)
-    await mongodb.database.refresh_tokens.create_index("user_id")
-    await mongodb.database.refresh_tokens.create_index("token_hash", unique=True)
-    await mongodb.database.refresh_tokens.create_index("expires_at")
-    await mongodb.database.refresh_tokens.create_index("is_revoked")
-    await mongodb.database.refresh_tokens.create_index([
-        ("user_id", 1),
-        ("is_revoked", 1)
-    ])
+    if settings.BOOK_TEXT_SEARCH:
+        await _create_index(
+            db.books,
+            [("title", "text"), ("author", "text"), ("genre", "text")],
+            weights={"title": 10, "author": 5, "genre": 1},
+            name="book_text_idx"
+        )
 
 
 def get_database() -> AsyncIOMotorDatabase:
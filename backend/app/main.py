@@ -1,10 +1,17 @@
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.db.mongo import connect_to_mongo, close_mongo_connection
+from app.db.mongo import connect_to_mongo, close_mongo_connection, get_database
 from app.routers import auth, users, books, lending
+from app.services.auth_service import AuthService
+from app.services.book_service import BookService
+from app.services.lending_service import LendingService
+from app.services.otp_service import OTPService
+from app.services.token_service import TokenService
 
 
 @asynccontextmanager
@@ -13,6 +20,15 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting Library Management System with JWT...")
     await connect_to_mongo()
+    
+    # Stateless services shared by every request
+    db = get_database()
+    app.state.otp_service = OTPService(db)
+    app.state.token_service = TokenService(db)
+    app.state.auth_service = AuthService(db, app.state.otp_service, app.state.token_service)
+    app.state.book_service = BookService(db)
+    app.state.lending_service = LendingService(db)
+    
     print("Application ready!")
     print(f"Static OTP for testing: {settings.STATIC_OTP}")
     print(f"Access Token Expiry: {settings.ACCESS_TOKEN_EXPIRE_MINUTES} minutes")
@@ -35,6 +51,7 @@ app = FastAPI(
     """,
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
 )
@@ -54,33 +71,40 @@ app.add_middleware(
         "http://127.0.0.1:5174"
     ],
     allow_credentials=False,  # Changed to False to match frontend
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+    allow_headers=["authorization", "content-type"],
     expose_headers=["*"],
-    max_age=3600,
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
+
+# Health bodies never change, so serialize them once at import
+_ROOT_BODY = orjson.dumps({
+    "status": "healthy",
+    "app": settings.APP_NAME,
+    "version": "2.0.0",
+    "auth": "JWT with OTP",
+    "message": "Library Management System API is running"
+})
+
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "database": "connected",
+    "auth_type": "JWT",
+    "otp_type": "Static (123456)",
+    "version": "2.0.0"
+})
+
+
 @app.get("/", tags=["Health"])
 async def root():
     """Root endpoint - health check."""
-    return {
-        "status": "healthy",
-        "app": settings.APP_NAME,
-        "version": "2.0.0",
-        "auth": "JWT with OTP",
-        "message": "Library Management System API is running"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Detailed health check endpoint."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "auth_type": "JWT",
-        "otp_type": "Static (123456)",
-        "version": "2.0.0"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
@@ -88,6 +112,7 @@ app.include_router(books.router, prefix="/api")
 app.include_router(lending.router, prefix="/api")
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     
     print(f"""
@@ -95,10 +120,22 @@ if __name__ == "__main__":
     
     """)
     
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    if settings.DEBUG:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # Production: one worker per core on uvloop/httptools (from uvicorn[standard])
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=max(2, os.cpu_count() or 1),
+            log_level="info"
+        )
\ No newline at end of file
@@ -1,6 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel, Field
-from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, Field
 from app.models.user_model import PyObjectId
 
 class BookModel(BaseModel):
@@ -12,11 +11,10 @@ class BookModel(BaseModel):
     total_copies: int = Field(..., ge=1, description="Total copies in library")
     available_copies: int = Field(..., ge=0, description="Available copies for lending")
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_schema_extra={
             "example": {
                 "title": "The Great Gatsby",
                 "author": "F. Scott Fitzgerald",
@@ -25,10 +23,4 @@ class BookModel(BaseModel):
                 "available_copies": 3
             }
         }
-    
-    def model_dump(self, **kwargs):
-        """Override to handle ObjectId serialization"""
-        data = super().model_dump(**kwargs)
-        if "_id" in data and data["_id"] is not None:
-            data["_id"] = str(data["_id"])
-        return data
\ No newline at end of file
+    )
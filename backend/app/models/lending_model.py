@@ -1,9 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from enum import Enum
-from pydantic import BaseModel, Field
-from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, Field
 from app.models.user_model import PyObjectId
+from app.utils.time_utils import utc_now
 
 class LendingStatus(str, Enum):
     
@@ -12,6 +12,9 @@ class LendingStatus(str, Enum):
     RETURNED = "returned"
     OVERDUE = "overdue"
 
+# Stored status values; a Literal validates as a plain string set lookup
+LendingStatusLiteral = Literal["reserved", "active", "returned", "overdue"]
+
 class LendingModel(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     user_id: str = Field(..., description="User ObjectId as string")
@@ -19,15 +22,14 @@ class LendingModel(BaseModel):
     lend_start_date: datetime = Field(..., description="Lending start date")
     lend_end_date: datetime = Field(..., description="Expected return date")
     actual_return_date: Optional[datetime] = Field(default=None, description="Actual return date")
-    status: LendingStatus = Field(default=LendingStatus.ACTIVE)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    status: LendingStatusLiteral = Field(default="active")
+    created_at: datetime = Field(default_factory=utc_now)
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        use_enum_values = True
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        use_enum_values=True,
+        json_schema_extra={
             "example": {
                 "user_id": "507f1f77bcf86cd799439011",
                 "book_id": "507f1f77bcf86cd799439012",
@@ -38,10 +40,4 @@ class LendingModel(BaseModel):
                 "created_at": "2025-01-15T10:30:00"
             }
         }
-    
-    def model_dump(self, **kwargs):
-        """Override to handle ObjectId serialization"""
-        data = super().model_dump(**kwargs)
-        if "_id" in data and data["_id"] is not None:
-            data["_id"] = str(data["_id"])
-        return data
\ No newline at end of file
+    )
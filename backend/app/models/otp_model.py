@@ -1,32 +1,34 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from enum import Enum
-from pydantic import BaseModel, Field, EmailStr
-from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from app.models.user_model import PyObjectId
+from app.utils.time_utils import utc_now
 
 class OTPPurpose(str, Enum):
     
     EMAIL_VERIFICATION = "email_verification"
     PASSWORD_RESET = "password_reset"
 
+# Stored purpose values; a Literal validates as a plain string set lookup
+OTPPurposeLiteral = Literal["email_verification", "password_reset"]
+
 class OTPModel(BaseModel):
     
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
     email: EmailStr = Field(..., description="Email address")
     otp_code: str = Field(..., description="OTP code (static 123456)")
-    purpose: OTPPurpose = Field(..., description="OTP purpose")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    purpose: OTPPurposeLiteral = Field(..., description="OTP purpose")
+    created_at: datetime = Field(default_factory=utc_now)
     expires_at: datetime = Field(..., description="OTP expiry time")
     is_used: bool = Field(default=False)
     attempts: int = Field(default=0, description="Verification attempts")
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        use_enum_values = True
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        use_enum_values=True,
+        json_schema_extra={
             "example": {
                 "email": "user@example.com",
                 "otp_code": "123456",
@@ -36,4 +38,5 @@ class OTPModel(BaseModel):
                 "is_used": False,
                 "attempts": 0
             }
-        }
\ No newline at end of file
+        }
+    )
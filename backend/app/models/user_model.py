@@ -1,24 +1,37 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, EmailStr
+from typing import Annotated, Any, Optional
+from pydantic import BaseModel, BeforeValidator, ConfigDict, EmailStr, Field, PlainSerializer, WithJsonSchema
 from bson import ObjectId
+from bson.errors import InvalidId
+from app.schemas.user_schema import UserResponse
+from app.utils.time_utils import utc_now
 
-class PyObjectId(ObjectId):
-    
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-    
-    @classmethod
-    def validate(cls, v, handler):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
+def _to_object_id(v: Any) -> ObjectId:
+    """Parse a value into an ObjectId in a single pass."""
+    if isinstance(v, ObjectId):
+        return v
+    try:
         return ObjectId(v)
-    
-    @classmethod
-    def __get_pydantic_json_schema__(cls, schema, handler):
-        schema.update(type="string")
-        return schema
+    except (InvalidId, TypeError):
+        raise ValueError("Invalid ObjectId")
+
+
+PyObjectId = Annotated[
+    ObjectId,
+    BeforeValidator(_to_object_id),
+    PlainSerializer(str, return_type=str),
+    WithJsonSchema({"type": "string"}),
+]
+
+
+# Fields needed to build a UserResponse; keeps hashed_password off the wire.
+# Derived from the schema once at import so the two cannot drift apart.
+USER_PUBLIC_PROJECTION = {
+    name: 1 for name in UserResponse.model_fields if name != "id"
+}
+
+# Login also needs the password hash to verify credentials
+USER_LOGIN_PROJECTION = {**USER_PUBLIC_PROJECTION, "hashed_password": 1}
 
 
 class UserModel(BaseModel):
@@ -30,14 +43,13 @@ class UserModel(BaseModel):
     bio: Optional[str] = Field(default=None, max_length=500, description="User biography")
     profile_picture: Optional[str] = Field(default=None, description="Profile picture URL or base64")
     is_verified: bool = Field(default=False, description="Email verification status")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     is_active: bool = Field(default=True)
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_schema_extra={
             "example": {
                 "name": "John Doe",
                 "email": "john@example.com",
@@ -48,4 +60,5 @@ class UserModel(BaseModel):
                 "created_at": "2025-01-15T10:30:00",
                 "is_active": True
             }
-        }
\ No newline at end of file
+        }
+    )
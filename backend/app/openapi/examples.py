@@ -0,0 +1,123 @@
+"""
+OpenAPI examples for request and response bodies.
+
+Kept out of the pydantic schemas so they are not part of model
+construction; routes attach them through ``responses=`` / ``openapi_extra``.
+"""
+
+from typing import Any, Dict
+
+
+def json_example(example: Any) -> Dict[str, Any]:
+    """Response entry for ``responses=`` showing a JSON example."""
+    return {"content": {"application/json": {"example": example}}}
+
+
+def request_example(example: Dict[str, Any]) -> Dict[str, Any]:
+    """``openapi_extra`` entry showing a JSON request body example."""
+    return {"requestBody": {"content": {"application/json": {"example": example}}}}
+
+
+# Users
+USER_EXAMPLE = {
+    "id": "507f1f77bcf86cd799439011",
+    "name": "John Doe",
+    "email": "john@example.com",
+    "bio": "Book lover and tech enthusiast",
+    "profile_picture": "https://example.com/avatar.jpg",
+    "is_verified": True,
+    "created_at": "2025-01-15T10:30:00",
+    "is_active": True
+}
+
+UPDATE_PROFILE_REQUEST_EXAMPLE = {
+    "name": "John Doe",
+    "bio": "Passionate reader and book collector",
+    "profile_picture": "data:image/jpeg;base64,/9j/4AAQ..."
+}
+
+UPDATE_PROFILE_EXAMPLE = {
+    "message": "Profile updated successfully",
+    "user": USER_EXAMPLE
+}
+
+# Books
+BOOK_EXAMPLE = {
+    "id": "507f1f77bcf86cd799439012",
+    "title": "The Great Gatsby",
+    "author": "F. Scott Fitzgerald",
+    "genre": "Classic Fiction",
+    "total_copies": 5,
+    "available_copies": 3
+}
+
+BOOK_SEARCH_EXAMPLE = {
+    "books": [
+        {
+            "id": "507f1f77bcf86cd799439012",
+            "title": "The Great Gatsby",
+            "author": "F. Scott Fitzgerald",
+            "genre": "Classic Fiction",
+            "total_copies": 5,
+            "available_copies": 3
+        }
+    ],
+    "total": 1,
+    "query": "gatsby"
+}
+
+BOOK_AVAILABILITY_EXAMPLE = {
+    "book": {
+        "id": "507f1f77bcf86cd799439012",
+        "title": "The Great Gatsby",
+        "author": "F. Scott Fitzgerald",
+        "genre": "Classic Fiction",
+        "total_copies": 5,
+        "available_copies": 0
+    },
+    "is_available": False,
+    "next_available_date": "2025-01-20T00:00:00",
+    "current_lending_return_date": "2025-01-20T00:00:00"
+}
+
+# Lending
+LEND_BOOK_REQUEST_EXAMPLE = {
+    "book_id": "507f1f77bcf86cd799439012",
+    "duration_days": 5,
+    "start_date": "2025-01-20"
+}
+
+LENDING_EXAMPLE = {
+    "id": "507f1f77bcf86cd799439013",
+    "user_id": "507f1f77bcf86cd799439011",
+    "book_id": "507f1f77bcf86cd799439012",
+    "book_title": "The Great Gatsby",
+    "lend_start_date": "2025-01-15T00:00:00",
+    "lend_end_date": "2025-01-20T00:00:00",
+    "actual_return_date": None,
+    "status": "active",
+    "created_at": "2025-01-15T10:30:00"
+}
+
+USER_DASHBOARD_EXAMPLE = {
+    "active_lendings": [
+        {
+            "id": "507f1f77bcf86cd799439013",
+            "book": {
+                "id": "507f1f77bcf86cd799439012",
+                "title": "The Great Gatsby",
+                "author": "F. Scott Fitzgerald",
+                "genre": "Classic Fiction",
+                "total_copies": 5,
+                "available_copies": 3
+            },
+            "lend_start_date": "2025-01-15T00:00:00",
+            "lend_end_date": "2025-01-20T00:00:00",
+            "status": "active",
+            "days_remaining": 5
+        }
+    ],
+    "reserved_lendings": [],
+    "lending_history": [],
+    "total_books_borrowed": 1
+}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 from app.services.auth_service import AuthService
 from app.services.token_service import TokenService
 from app.models.otp_model import OTPPurpose
@@ -11,6 +12,7 @@ from app.schemas.auth_schema import (
     LoginResponse,
     RefreshTokenRequest,
     RefreshTokenResponse,
+    TokenResponse,
     ForgotPasswordRequest,
     ForgotPasswordResponse,
     ResetPasswordRequest,
@@ -20,6 +22,8 @@ from app.schemas.auth_schema import (
     ResendOTPResponse
 )
 from app.utils.dependencies import get_auth_service, get_token_service
+from app.utils.cache import user_cache
+from app.core.security import decode_token
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -38,10 +42,13 @@ async def signup(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Create new user account and send OTP."""
-    return await auth_service.signup_user(
-        name=signup_data.name,
-        email=signup_data.email,
-        password=signup_data.password
+    return ORJSONResponse(
+        await auth_service.signup_user(
+            name=signup_data.name,
+            email=signup_data.email,
+            password=signup_data.password
+        ),
+        status_code=status.HTTP_201_CREATED
     )
 
 
@@ -60,9 +67,11 @@ async def verify_otp(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Verify email with OTP."""
-    return await auth_service.verify_email(
-        email=verify_data.email,
-        otp_code=verify_data.otp_code
+    return ORJSONResponse(
+        await auth_service.verify_email(
+            email=verify_data.email,
+            otp_code=verify_data.otp_code
+        )
     )
 
 
@@ -81,9 +90,11 @@ async def resend_otp(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Resend OTP for email verification."""
-    return await auth_service.resend_otp(
-        email=resend_data.email,
-        purpose=OTPPurpose.EMAIL_VERIFICATION
+    return ORJSONResponse(
+        await auth_service.resend_otp(
+            email=resend_data.email,
+            purpose=OTPPurpose.EMAIL_VERIFICATION
+        )
     )
 
 @router.post(
@@ -101,9 +112,11 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Authenticate user and return JWT tokens."""
-    return await auth_service.login_user(
-        email=login_data.email,
-        password=login_data.password
+    return ORJSONResponse(
+        await auth_service.login_user(
+            email=login_data.email,
+            password=login_data.password
+        )
     )
 @router.post(
     "/refresh",
@@ -124,11 +137,11 @@ async def refresh_token(
         refresh_token=refresh_data.refresh_token
     )
     
-    return RefreshTokenResponse(
+    return ORJSONResponse(TokenResponse(
         access_token=new_access_token,
         refresh_token=new_refresh_token,
         token_type="bearer"
-    )
+    ))
 @router.post(
     "/logout",
     response_model=LogoutResponse,
@@ -146,7 +159,11 @@ async def logout(
     """Logout user by revoking refresh token."""
     await token_service.revoke_token(refresh_data.refresh_token)
     
-    return LogoutResponse(
+    payload = decode_token(refresh_data.refresh_token)
+    if payload and payload.get("sub"):
+        user_cache.pop(payload["sub"])
+    
+    return LogoutResponse.model_construct(
         message="Logout successful. All tokens revoked."
     )
 @router.post(
@@ -165,8 +182,10 @@ async def forgot_password(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Send OTP for password reset."""
-    return await auth_service.forgot_password(
-        email=forgot_data.email
+    return ORJSONResponse(
+        await auth_service.forgot_password(
+            email=forgot_data.email
+        )
     )
 
 
@@ -185,8 +204,10 @@ async def reset_password(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Reset password with OTP."""
-    return await auth_service.reset_password(
-        email=reset_data.email,
-        otp_code=reset_data.otp_code,
-        new_password=reset_data.new_password
+    return ORJSONResponse(
+        await auth_service.reset_password(
+            email=reset_data.email,
+            otp_code=reset_data.otp_code,
+            new_password=reset_data.new_password
+        )
     )
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
 from typing import List
 from app.services.book_service import BookService
 from app.schemas.book_schema import (
@@ -7,6 +8,12 @@ from app.schemas.book_schema import (
     BookAvailabilityResponse
 )
 from app.schemas.user_schema import UserResponse
+from app.openapi.examples import (
+    BOOK_EXAMPLE,
+    BOOK_SEARCH_EXAMPLE,
+    BOOK_AVAILABILITY_EXAMPLE,
+    json_example
+)
 from app.utils.dependencies import get_book_service, get_current_user
 router = APIRouter(prefix="/books", tags=["Books"])
 
@@ -14,6 +21,7 @@ router = APIRouter(prefix="/books", tags=["Books"])
     "/search",
     response_model=BookSearchResponse,
     status_code=status.HTTP_200_OK,
+    responses={200: json_example(BOOK_SEARCH_EXAMPLE)},
     summary="Search books",
     description="""
     Smart search across book title, author, and genre.
@@ -28,14 +36,16 @@ async def search_books(
     """
     Search books by title, author, or genre.
     Protected route - requires authentication.
+    Encoded straight from the service dict, skipping response-model validation.
     """
-    return await book_service.search_books(query, limit)
+    return ORJSONResponse(await book_service.search_books(query, limit))
 
 
 @router.get(
     "/all",
     response_model=List[BookResponse],
     status_code=status.HTTP_200_OK,
+    responses={200: json_example([BOOK_EXAMPLE])},
     summary="Get all books",
     description="""
     Fetch all books in library (for browsing).
@@ -50,14 +60,16 @@ async def get_all_books(
     """
     Get all books in library.
     Protected route - requires authentication.
+    Encoded straight from the service dicts, skipping response-model validation.
     """
-    return await book_service.get_all_books(limit)
+    return ORJSONResponse(await book_service.get_all_books(limit))
 
 
 @router.get(
     "/{book_id}",
     response_model=BookResponse,
     status_code=status.HTTP_200_OK,
+    responses={200: json_example(BOOK_EXAMPLE)},
     summary="Get book by ID",
     description="""
     Fetch single book details by ID.
@@ -80,6 +92,7 @@ async def get_book(
     "/{book_id}/availability",
     response_model=BookAvailabilityResponse,
     status_code=status.HTTP_200_OK,
+    responses={200: json_example(BOOK_AVAILABILITY_EXAMPLE)},
     summary="Check book availability",
     description="""
     Check if book is available for lending.
@@ -1,5 +1,6 @@
 
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 from app.services.lending_service import LendingService
 from app.schemas.lending_schema import (
     LendBookRequest,
@@ -7,12 +8,21 @@ from app.schemas.lending_schema import (
     UserDashboardResponse
 )
 from app.schemas.user_schema import UserResponse
+from app.openapi.examples import (
+    LENDING_EXAMPLE,
+    LEND_BOOK_REQUEST_EXAMPLE,
+    USER_DASHBOARD_EXAMPLE,
+    json_example,
+    request_example
+)
 from app.utils.dependencies import get_lending_service, get_current_user
 router = APIRouter(prefix="/lending", tags=["Lending"])
 @router.post(
     "/lend",
     response_model=LendingResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={201: json_example(LENDING_EXAMPLE)},
+    openapi_extra=request_example(LEND_BOOK_REQUEST_EXAMPLE),
     summary="Lend a book",
     description="""
     Borrow a book immediately or create advance reservation.
@@ -35,6 +45,7 @@ async def lend_book(
     "/dashboard",
     response_model=UserDashboardResponse,
     status_code=status.HTTP_200_OK,
+    responses={200: json_example(USER_DASHBOARD_EXAMPLE)},
     summary="Get user lending dashboard",
     description="""
     Fetch user's complete lending information.
@@ -48,5 +59,6 @@ async def get_user_dashboard(
     """
     Get authenticated user's lending dashboard.
     Shows active, reserved, and historical lendings.
+    Encoded straight from the service dicts, skipping response-model validation.
     """
-    return await lending_service.get_user_dashboard(current_user.id)
\ No newline at end of file
+    return ORJSONResponse(await lending_service.get_user_dashboard(current_user.id))
\ No newline at end of file
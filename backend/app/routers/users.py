@@ -1,10 +1,19 @@
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemas.user_schema import UserResponse, UpdateProfileRequest, UpdateProfileResponse
 from app.utils.dependencies import get_current_user
+from app.utils.cache import user_cache
 from app.db.mongo import get_database
+from app.models.user_model import USER_PUBLIC_PROJECTION
+from app.openapi.examples import (
+    USER_EXAMPLE,
+    UPDATE_PROFILE_EXAMPLE,
+    UPDATE_PROFILE_REQUEST_EXAMPLE,
+    json_example,
+    request_example
+)
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from bson import ObjectId
+from pymongo import ReturnDocument
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -14,6 +23,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
     "/me",
     response_model=UserResponse,
     status_code=status.HTTP_200_OK,
+    responses={200: json_example(USER_EXAMPLE)},
     summary="Get current user profile",
     description="""
     Fetch authenticated user's profile information.
@@ -31,6 +41,8 @@ async def get_current_user_profile(
     "/me/profile",
     response_model=UpdateProfileResponse,
     status_code=status.HTTP_200_OK,
+    responses={200: json_example(UPDATE_PROFILE_EXAMPLE)},
+    openapi_extra=request_example(UPDATE_PROFILE_REQUEST_EXAMPLE),
     summary="Update user profile",
     description="""
     Update the current user's profile information.
@@ -62,17 +74,28 @@ async def update_user_profile(
     if profile_data.profile_picture is not None:
         update_fields["profile_picture"] = profile_data.profile_picture
     
-    # Only update if there are fields to update
-    if update_fields:
-        await db.users.update_one(
-            {"_id": ObjectId(current_user.id)},
-            {"$set": update_fields}
+    # Nothing to change - skip the database entirely
+    if not update_fields:
+        return UpdateProfileResponse.model_construct(
+            message="Profile updated successfully",
+            user=current_user
         )
     
-    # Fetch updated user
-    updated_user = await db.users.find_one({"_id": ObjectId(current_user.id)})
+    # Update and fetch the updated user in one round-trip
+    updated_user = await db.users.find_one_and_update(
+        {"_id": current_user.oid},
+        {"$set": update_fields},
+        projection=USER_PUBLIC_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
     
-    user_response = UserResponse(
+    if not updated_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found."
+        )
+    
+    user_response = UserResponse.model_construct(
         id=str(updated_user["_id"]),
         name=updated_user["name"],
         email=updated_user["email"],
@@ -83,7 +106,9 @@ async def update_user_profile(
         is_active=updated_user.get("is_active", True)
     )
     
-    return UpdateProfileResponse(
+    user_cache.set(user_response.id, user_response)
+    
+    return UpdateProfileResponse.model_construct(
         message="Profile updated successfully",
         user=user_response
     )
\ No newline at end of file
@@ -1,9 +1,39 @@
 import re
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing_extensions import TypedDict
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 
 # Allowed email domains
-ALLOWED_EMAIL_DOMAINS = ['gmail.com', 'outlook.com', 'hotmail.com', 'yahoo.com', 'yahoo.co', 'live.com']
+ALLOWED_EMAIL_DOMAINS = frozenset({'gmail.com', 'outlook.com', 'hotmail.com', 'yahoo.com', 'yahoo.co', 'live.com'})
+_ALLOWED_DOMAINS_DISPLAY = ', '.join(sorted(ALLOWED_EMAIL_DOMAINS))
+
+# Password policy patterns, compiled once at import
+_UPPER_RE = re.compile(r'[A-Z]')
+_LOWER_RE = re.compile(r'[a-z]')
+_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;\'`~]')
+
+
+def _check_password_policy(v: str) -> str:
+    """
+    Password must:
+    - Be at least 8 characters
+    - Contain at least one uppercase letter
+    - Contain at least one lowercase letter
+    - Contain at least one special character
+    """
+    if len(v) < 8:
+        raise ValueError("Password must be at least 8 characters")
+    
+    if not _UPPER_RE.search(v):
+        raise ValueError("Password must contain at least one uppercase letter")
+    
+    if not _LOWER_RE.search(v):
+        raise ValueError("Password must contain at least one lowercase letter")
+    
+    if not _SPECIAL_RE.search(v):
+        raise ValueError("Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)")
+    
+    return v
 
 
 class SignupRequest(BaseModel):
@@ -17,38 +47,20 @@ class SignupRequest(BaseModel):
     def validate_email_domain(cls, v: str) -> str:
         """Validate email is from Gmail, Outlook, or Yahoo."""
         email_lower = v.lower()
-        domain = email_lower.split('@')[-1]
+        domain = email_lower.rpartition('@')[2]
         
         if domain not in ALLOWED_EMAIL_DOMAINS:
             raise ValueError(
                 f"Email must be from Gmail, Outlook, or Yahoo. "
-                f"Allowed domains: {', '.join(ALLOWED_EMAIL_DOMAINS)}"
+                f"Allowed domains: {_ALLOWED_DOMAINS_DISPLAY}"
             )
         return email_lower
     
     @field_validator('password')
     @classmethod
     def validate_password(cls, v: str) -> str:
-        """
-        Password must:
-        - Be at least 8 characters
-        - Contain at least one uppercase letter
-        - Contain at least one lowercase letter
-        - Contain at least one special character
-        """
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters")
-        
-        if not re.search(r'[A-Z]', v):
-            raise ValueError("Password must contain at least one uppercase letter")
-        
-        if not re.search(r'[a-z]', v):
-            raise ValueError("Password must contain at least one lowercase letter")
-        
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;\'`~]', v):
-            raise ValueError("Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)")
-        
-        return v
+        """Apply the shared password policy."""
+        return _check_password_policy(v)
 
 
 class SignupResponse(BaseModel):
@@ -59,6 +71,8 @@ class SignupResponse(BaseModel):
     message: str = "Signup successful. Please verify your email with OTP."
     email: EmailStr
     otp_sent: bool = True  # Static OTP, always True
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 class VerifyOTPRequest(BaseModel):
     """OTP verification request."""
@@ -71,6 +85,8 @@ class VerifyOTPResponse(BaseModel):
     message: str = "Email verified successfully. You can now login."
     email: EmailStr
     verified: bool = True
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 class LoginRequest(BaseModel):
     """User login request."""
@@ -78,11 +94,11 @@ class LoginRequest(BaseModel):
     password: str = Field(..., min_length=6)
 
 
-class TokenResponse(BaseModel):
-    
+class TokenResponse(TypedDict):
+    """Access/refresh token pair; a plain dict at runtime."""
     access_token: str
     refresh_token: str
-    token_type: str = "bearer"
+    token_type: str
 
 
 class LoginResponse(BaseModel):
@@ -90,6 +106,8 @@ class LoginResponse(BaseModel):
     message: str = "Login successful"
     user: dict
     tokens: TokenResponse
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 class RefreshTokenRequest(BaseModel):
     """Request to refresh access token."""
@@ -100,6 +118,8 @@ class RefreshTokenResponse(BaseModel):
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 class ForgotPasswordRequest(BaseModel):
     """Request to reset password."""
@@ -111,6 +131,8 @@ class ForgotPasswordResponse(BaseModel):
     message: str = "OTP sent to your email for password reset."
     email: EmailStr
     otp_sent: bool = True
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class ResetPasswordRequest(BaseModel):
@@ -122,35 +144,21 @@ class ResetPasswordRequest(BaseModel):
     @field_validator('new_password')
     @classmethod
     def validate_password(cls, v: str) -> str:
-        """
-        Password must:
-        - Be at least 8 characters
-        - Contain at least one uppercase letter
-        - Contain at least one lowercase letter
-        - Contain at least one special character
-        """
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters")
-        
-        if not re.search(r'[A-Z]', v):
-            raise ValueError("Password must contain at least one uppercase letter")
-        
-        if not re.search(r'[a-z]', v):
-            raise ValueError("Password must contain at least one lowercase letter")
-        
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;\'`~]', v):
-            raise ValueError("Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)")
-        
-        return v
+        """Apply the shared password policy."""
+        return _check_password_policy(v)
 
 class ResetPasswordResponse(BaseModel):
     """Response after successful password reset."""
     message: str = "Password reset successful. Please login with new password."
     email: EmailStr
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 class LogoutResponse(BaseModel):
     """Response after logout."""
     message: str = "Logout successful"
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 class ResendOTPRequest(BaseModel):
     """Request to resend OTP."""
@@ -161,4 +169,6 @@ class ResendOTPResponse(BaseModel):
     """Response after OTP resend."""
     message: str = "OTP resent successfully"
     email: EmailStr
-    otp_sent: bool = True
\ No newline at end of file
+    otp_sent: bool = True
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
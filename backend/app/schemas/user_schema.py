@@ -1,6 +1,8 @@
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 
 class UserResponse(BaseModel):
@@ -15,19 +17,12 @@ class UserResponse(BaseModel):
     created_at: datetime
     is_active: bool = True
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "507f1f77bcf86cd799439011",
-                "name": "John Doe",
-                "email": "john@example.com",
-                "bio": "Book lover and tech enthusiast",
-                "profile_picture": "https://example.com/avatar.jpg",
-                "is_verified": True,
-                "created_at": "2025-01-15T10:30:00",
-                "is_active": True
-            }
-        }
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
+    @cached_property
+    def oid(self) -> ObjectId:
+        """User ID as an ObjectId, parsed once per instance (not serialized)."""
+        return ObjectId(self.id)
 
 
 class UpdateProfileRequest(BaseModel):
@@ -56,19 +51,12 @@ class UpdateProfileRequest(BaseModel):
             if len(v) > 500:
                 raise ValueError("Bio must be at most 500 characters")
         return v
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "name": "John Doe",
-                "bio": "Passionate reader and book collector",
-                "profile_picture": "data:image/jpeg;base64,/9j/4AAQ..."
-            }
-        }
 
 
 class UpdateProfileResponse(BaseModel):
     """Response after profile update."""
     
     message: str = "Profile updated successfully"
-    user: UserResponse
\ No newline at end of file
+    user: UserResponse
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
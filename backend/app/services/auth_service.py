@@ -1,94 +1,111 @@
+import asyncio
+import logging
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError
 
 from app.core.security import hash_password, verify_password
-from app.models.user_model import UserModel
+from app.models.user_model import UserModel, USER_LOGIN_PROJECTION, USER_PUBLIC_PROJECTION
 from app.models.otp_model import OTPPurpose
+from app.schemas.auth_schema import TokenResponse
 from app.schemas.user_schema import UserResponse
 from app.services.otp_service import OTPService
 from app.services.token_service import TokenService
+from app.utils.cache import user_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Response messages
+_SIGNUP_MSG = "Signup successful. Please verify your email with OTP: 123456"
+_VERIFIED_MSG = "Email verified successfully. You can now login."
+_LOGIN_MSG = "Login successful"
+_FORGOT_UNKNOWN_MSG = "If email exists, OTP has been sent: 123456"
+_FORGOT_MSG = "OTP sent to your email for password reset: 123456"
+_RESET_MSG = "Password reset successful. Please login with new password."
+_RESEND_MSG = "OTP resent successfully: 123456"
 
 
 class AuthService:
     
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        otp_service: OTPService,
+        token_service: TokenService
+    ):
         self.db = db
         self.users_collection = db.users
-        self.otp_service = OTPService(db)
-        self.token_service = TokenService(db)
+        self.otp_service = otp_service
+        self.token_service = token_service
     
     async def signup_user(self, name: str, email: str, password: str) -> dict:
+        email_l = email.lower()
+        
         try:
-            print(f"\n👤 Signup attempt for: {email}")
-            
-            # Check existing user
-            existing_user = await self.users_collection.find_one(
-                {"email": email.lower()}
-            )
-            
-            if existing_user:
-                print(f"   ❌ Email already registered: {email}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered."
-                )
-            
-            print(f"   ✅ Email available")
+            logger.debug("Signup attempt for %s", email)
             
             # Create user
             user_model = UserModel(
                 name=name,
-                email=email.lower(),
-                hashed_password=hash_password(password),
+                email=email_l,
+                hashed_password=await asyncio.to_thread(hash_password, password),
                 is_verified=False  # Requires OTP verification
             )
             
-            print(f"   💾 Inserting user into database...")
-            result = await self.users_collection.insert_one(
-                user_model.model_dump(by_alias=True, exclude={"id"})
-            )
-            print(f"   ✅ User created with ID: {result.inserted_id}")
+            # The unique email index rejects existing users in the same round-trip
+            try:
+                result = await self.users_collection.insert_one(
+                    user_model.model_dump(by_alias=True, exclude={"id"})
+                )
+            except DuplicateKeyError:
+                logger.debug("Email already registered: %s", email)
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email already registered."
+                )
+            logger.debug("User created with ID %s", result.inserted_id)
             
             # Generate OTP
-            print(f"   🔑 Generating OTP...")
             otp_code = await self.otp_service.generate_otp(
-                email=email.lower(),
+                email=email_l,
                 purpose=OTPPurpose.EMAIL_VERIFICATION
             )
             
             # In production: Email would be sent here
-            # For testing: OTP is printed in console
-            print(f"   ✅ OTP Generated: {otp_code}")
-            print(f"   📧 OTP for {email}: {otp_code}\n")
+            # For testing: OTP is logged at debug level
+            logger.debug("Email verification OTP for %s: %s", email, otp_code)
             
             return {
-                "message": "Signup successful. Please verify your email with OTP: 123456",
-                "email": email.lower(),
+                "message": _SIGNUP_MSG,
+                "email": email_l,
                 "otp_sent": True
             }
             
         except HTTPException:
             raise
         except Exception as e:
-            print(f"   ❌ Signup error: {str(e)}")
-            print(f"   Error type: {type(e).__name__}\n")
+            logger.exception("Signup failed for %s", email)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Signup failed: {str(e)}"
             )
     
     async def verify_email(self, email: str, otp_code: str) -> dict:
+        email_l = email.lower()
         
         await self.otp_service.verify_otp(
-            email=email.lower(),
+            email=email_l,
             otp_code=otp_code,
             purpose=OTPPurpose.EMAIL_VERIFICATION
         )
         
         # Update user verification status
         result = await self.users_collection.update_one(
-            {"email": email.lower()},
+            {"email": email_l},
             {"$set": {"is_verified": True}}
         )
         
@@ -99,17 +116,18 @@ class AuthService:
             )
         
         return {
-            "message": "Email verified successfully. You can now login.",
-            "email": email.lower(),
+            "message": _VERIFIED_MSG,
+            "email": email_l,
             "verified": True
         }
     
     async def login_user(self, email: str, password: str) -> dict:
-        
+        email_l = email.lower()
         
         # Find user
         user = await self.users_collection.find_one(
-            {"email": email.lower()}
+            {"email": email_l},
+            projection=USER_LOGIN_PROJECTION
         )
         
         if not user:
@@ -118,8 +136,8 @@ class AuthService:
                 detail="Invalid email or password."
             )
         
-        # Verify password
-        if not verify_password(password, user["hashed_password"]):
+        # Verify password off the event loop (bcrypt is CPU-bound)
+        if not await asyncio.to_thread(verify_password, password, user["hashed_password"]):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password."
@@ -139,74 +157,80 @@ class AuthService:
                 detail="Account is inactive."
             )
         
+        user_id = str(user["_id"])
+        
         # Generate tokens
         access_token, refresh_token = await self.token_service.create_tokens(
-            user_id=str(user["_id"])
-        )
-        
-        # Prepare user response
-        user_data = UserResponse(
-            id=str(user["_id"]),
-            name=user["name"],
-            email=user["email"],
-            bio=user.get("bio"),
-            profile_picture=user.get("profile_picture"),
-            is_verified=user["is_verified"],
-            created_at=user["created_at"],
-            is_active=user["is_active"]
+            user_id=user_id
         )
         
         return {
-            "message": "Login successful",
-            "user": user_data.model_dump(),
-            "tokens": {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "token_type": "bearer"
-            }
+            "message": _LOGIN_MSG,
+            # Same shape as UserResponse, built straight from the trusted document
+            "user": {
+                "id": user_id,
+                "name": user["name"],
+                "email": user["email"],
+                "bio": user.get("bio"),
+                "profile_picture": user.get("profile_picture"),
+                "is_verified": user["is_verified"],
+                "created_at": user["created_at"],
+                "is_active": user.get("is_active", True)
+            },
+            "tokens": TokenResponse(
+                access_token=access_token,
+                refresh_token=refresh_token,
+                token_type="bearer"
+            )
         }
     
     async def forgot_password(self, email: str) -> dict:
+        email_l = email.lower()
         
         # Check user exists
         user = await self.users_collection.find_one(
-            {"email": email.lower()}
+            {"email": email_l},
+            projection={"_id": 1}
         )
         
         if not user:
             # Security: Don't reveal if email exists
             # Return success anyway to prevent email enumeration
             return {
-                "message": "If email exists, OTP has been sent: 123456",
-                "email": email.lower(),
+                "message": _FORGOT_UNKNOWN_MSG,
+                "email": email_l,
                 "otp_sent": True
             }
         
         # Generate OTP
         otp_code = await self.otp_service.generate_otp(
-            email=email.lower(),
+            email=email_l,
             purpose=OTPPurpose.PASSWORD_RESET
         )
         
-        print(f"📧 Password Reset OTP for {email}: {otp_code}")
+        logger.debug("Password reset OTP for %s: %s", email, otp_code)
         
         return {
-            "message": "OTP sent to your email for password reset: 123456",
-            "email": email.lower(),
+            "message": _FORGOT_MSG,
+            "email": email_l,
             "otp_sent": True
         }
     
     async def reset_password(self, email: str, otp_code: str, new_password: str) -> dict:
+        email_l = email.lower()
         
-        await self.otp_service.verify_otp(
-            email=email.lower(),
-            otp_code=otp_code,
-            purpose=OTPPurpose.PASSWORD_RESET
-        )
-        
-        # Find user
-        user = await self.users_collection.find_one(
-            {"email": email.lower()}
+        # Verify the OTP and look up the user concurrently; an invalid OTP
+        # still raises before anything is written
+        _, user = await asyncio.gather(
+            self.otp_service.verify_otp(
+                email=email_l,
+                otp_code=otp_code,
+                purpose=OTPPurpose.PASSWORD_RESET
+            ),
+            self.users_collection.find_one(
+                {"email": email_l},
+                projection={"_id": 1}
+            )
         )
         
         if not user:
@@ -215,10 +239,12 @@ class AuthService:
                 detail="User not found."
             )
         
-        # Update password
+        user_id = str(user["_id"])
+        hashed_password = await asyncio.to_thread(hash_password, new_password)
+        
         result = await self.users_collection.update_one(
             {"_id": user["_id"]},
-            {"$set": {"hashed_password": hash_password(new_password)}}
+            {"$set": {"hashed_password": hashed_password}}
         )
         
         if result.matched_count == 0:
@@ -227,56 +253,62 @@ class AuthService:
                 detail="Failed to update password."
             )
         
-        # Revoke all refresh tokens (security: force re-login on all devices)
-        await self.token_service.revoke_all_user_tokens(str(user["_id"]))
+        # Revoke all refresh tokens only once the new password is stored
+        # (security: force re-login on all devices)
+        await self.token_service.revoke_all_user_tokens(user_id)
+        user_cache.pop(user_id)
         
         return {
-            "message": "Password reset successful. Please login with new password.",
-            "email": email.lower()
+            "message": _RESET_MSG,
+            "email": email_l
         }
     
     async def resend_otp(self, email: str, purpose: OTPPurpose) -> dict:
-        
+        email_l = email.lower()
         
         # Generate new OTP
         otp_code = await self.otp_service.generate_otp(
-            email=email.lower(),
+            email=email_l,
             purpose=purpose
         )
         
-        print(f"📧 Resent OTP for {email}: {otp_code}")
+        logger.debug("Resent OTP for %s: %s", email, otp_code)
         
         return {
-            "message": "OTP resent successfully: 123456",
-            "email": email.lower(),
+            "message": _RESEND_MSG,
+            "email": email_l,
             "otp_sent": True
         }
     
     async def get_user_by_id(self, user_id: str) -> UserResponse:
         
+        # Reject malformed IDs before touching the database
         try:
-            user = await self.users_collection.find_one(
-                {"_id": ObjectId(user_id)}
-            )
-            
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found."
-                )
-            
-            return UserResponse(
-                id=str(user["_id"]),
-                name=user["name"],
-                email=user["email"],
-                bio=user.get("bio"),
-                profile_picture=user.get("profile_picture"),
-                is_verified=user.get("is_verified", False),
-                created_at=user["created_at"],
-                is_active=user.get("is_active", True)
+            oid = ObjectId(user_id)
+        except (InvalidId, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid user ID."
             )
-        except Exception:
+        
+        user = await self.users_collection.find_one(
+            {"_id": oid},
+            projection=USER_PUBLIC_PROJECTION
+        )
+        
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Invalid user ID."
-            )
\ No newline at end of file
+                detail="User not found."
+            )
+        
+        return UserResponse.model_construct(
+            id=str(user["_id"]),
+            name=user["name"],
+            email=user["email"],
+            bio=user.get("bio"),
+            profile_picture=user.get("profile_picture"),
+            is_verified=user.get("is_verified", False),
+            created_at=user["created_at"],
+            is_active=user.get("is_active", True)
+        )
@@ -1,11 +1,24 @@
 
+import re
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status
 from bson import ObjectId
-from app.schemas.book_schema import BookResponse, BookSearchResponse, BookAvailabilityResponse
+from bson.errors import InvalidId
+from app.schemas.book_schema import BookResponse, BookAvailabilityResponse
 from app.models.lending_model import LendingStatus
 from datetime import datetime
+from app.core.config import settings
+
+
+# Fields needed to build a BookResponse
+BOOK_PROJECTION = {
+    "title": 1,
+    "author": 1,
+    "genre": 1,
+    "total_copies": 1,
+    "available_copies": 1
+}
 
 
 class BookService:
@@ -15,77 +28,62 @@ class BookService:
         self.books_collection = db.books
         self.lendings_collection = db.lendings
     
-    async def search_books(self, query: str, limit: int = 50) -> BookSearchResponse:
+    async def search_books(self, query: str, limit: int = 50) -> dict:
         """
-        Search books using MongoDB text search.
+        Search books by title, author, or genre.
+        
+        Matches the query as a case-insensitive word prefix, so "gat" finds
+        "The Great Gatsby". The pattern is neither anchored to the start of
+        the field nor case-sensitive, so no index can seek on it and each
+        search scans the books collection; keep the catalogue small or
+        enable BOOK_TEXT_SEARCH.
+        
+        With BOOK_TEXT_SEARCH enabled, the weighted text index is used
+        instead: whole (stemmed) words only, ranked title > author > genre.
+        
+        Returns a plain dict shaped like BookSearchResponse so the router
+        can encode it directly with orjson.
         
         Args:
             query: Search query string
             limit: Maximum number of results
             
         Returns:
-            BookSearchResponse with matching books
+            Dict with matching books, total and query
         """
         
-        try:
-            # Use MongoDB text search (searches title, author, genre)
-            # $text operator uses the text index we created
+        if settings.BOOK_TEXT_SEARCH:
+            score = {"$meta": "textScore"}
             cursor = self.books_collection.find(
                 {"$text": {"$search": query}},
-                {"score": {"$meta": "textScore"}}  # Sort by relevance
-            ).sort([("score", {"$meta": "textScore"})]).limit(limit)
-            
-            books = []
-            async for book_doc in cursor:
-                books.append(BookResponse(
-                    id=str(book_doc["_id"]),
-                    title=book_doc["title"],
-                    author=book_doc["author"],
-                    genre=book_doc["genre"],
-                    total_copies=book_doc["total_copies"],
-                    available_copies=book_doc["available_copies"]
-                ))
-            
-            return BookSearchResponse(
-                books=books,
-                total=len(books),
-                query=query
-            )
-        
-        except Exception as e:
-            # If text index doesn't exist, fall back to regex search
-            if "text index required" in str(e).lower():
-                # Fallback to regex search across title, author, genre
-                pattern = {"$regex": query, "$options": "i"}
-                cursor = self.books_collection.find({
+                projection={**BOOK_PROJECTION, "score": score}
+            ).sort([("score", score)]).batch_size(limit).limit(limit)
+        else:
+            pattern = {"$regex": f"(^|\\s){re.escape(query)}", "$options": "i"}
+            cursor = self.books_collection.find(
+                {
                     "$or": [
                         {"title": pattern},
                         {"author": pattern},
                         {"genre": pattern}
                     ]
-                }).limit(limit)
-                
-                books = []
-                async for book_doc in cursor:
-                    books.append(BookResponse(
-                        id=str(book_doc["_id"]),
-                        title=book_doc["title"],
-                        author=book_doc["author"],
-                        genre=book_doc["genre"],
-                        total_copies=book_doc["total_copies"],
-                        available_copies=book_doc["available_copies"]
-                    ))
-                
-                return BookSearchResponse(
-                    books=books,
-                    total=len(books),
-                    query=query
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Search failed: {str(e)}"
-                )
+                },
+                projection=BOOK_PROJECTION
+            ).batch_size(limit).limit(limit)
+        
+        books = [
+            {
+                "id": str(book_doc["_id"]),
+                "title": book_doc["title"],
+                "author": book_doc["author"],
+                "genre": book_doc["genre"],
+                "total_copies": book_doc["total_copies"],
+                "available_copies": book_doc["available_copies"]
+            }
+            for book_doc in await cursor.to_list(length=limit)
+        ]
+        
+        return {"books": books, "total": len(books), "query": query}
     
     async def get_book_by_id(self, book_id: str) -> BookResponse:
         """
@@ -102,30 +100,32 @@ class BookService:
         """
         
         try:
-            book_doc = await self.books_collection.find_one(
-                {"_id": ObjectId(book_id)}
-            )
-            
-            if not book_doc:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Book not found"
-                )
-            
-            return BookResponse(
-                id=str(book_doc["_id"]),
-                title=book_doc["title"],
-                author=book_doc["author"],
-                genre=book_doc["genre"],
-                total_copies=book_doc["total_copies"],
-                available_copies=book_doc["available_copies"]
-            )
-            
-        except Exception as e:
+            book_oid = ObjectId(book_id)
+        except (InvalidId, TypeError):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Invalid book ID"
             )
+        
+        book_doc = await self.books_collection.find_one(
+            {"_id": book_oid},
+            projection=BOOK_PROJECTION
+        )
+        
+        if not book_doc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book not found"
+            )
+        
+        return BookResponse.model_construct(
+            id=str(book_doc["_id"]),
+            title=book_doc["title"],
+            author=book_doc["author"],
+            genre=book_doc["genre"],
+            total_copies=book_doc["total_copies"],
+            available_copies=book_doc["available_copies"]
+        )
     
     async def check_book_availability(self, book_id: str) -> BookAvailabilityResponse:
         """
@@ -148,7 +148,7 @@ class BookService:
         
         # Check if available now
         if book.available_copies > 0:
-            return BookAvailabilityResponse(
+            return BookAvailabilityResponse.model_construct(
                 book=book,
                 is_available=True,
                 next_available_date=None,
@@ -162,12 +162,13 @@ class BookService:
                 "book_id": book_id,
                 "status": {"$in": [LendingStatus.ACTIVE.value, LendingStatus.RESERVED.value]}
             },
+            projection={"_id": 0, "lend_end_date": 1},
             sort=[("lend_end_date", 1)]  # Sort by end date ascending (earliest first)
         )
         
         if earliest_lending:
-            return_date = earliest_lending["lend_end_date"].isoformat()
-            return BookAvailabilityResponse(
+            return_date = earliest_lending["lend_end_date"]
+            return BookAvailabilityResponse.model_construct(
                 book=book,
                 is_available=False,
                 next_available_date=return_date,
@@ -176,39 +177,45 @@ class BookService:
         
         # No active lendings but available_copies = 0 (data inconsistency)
         # This shouldn't happen but handle gracefully
-        return BookAvailabilityResponse(
+        return BookAvailabilityResponse.model_construct(
             book=book,
             is_available=False,
             next_available_date=None,
             current_lending_return_date=None
         )
     
-    async def get_all_books(self, limit: int = 100) -> List[BookResponse]:
+    async def get_all_books(self, limit: int = 100) -> List[dict]:
         """
         Fetch all books (for browsing).
         Used when no search query provided.
         
+        Returns plain dicts shaped like BookResponse so the router can
+        encode them directly with orjson.
+        
         Args:
             limit: Maximum number of books to return
             
         Returns:
-            List of BookResponse objects
+            List of book dicts
         """
         
-        cursor = self.books_collection.find().limit(limit)
-        books = []
-        
-        async for book_doc in cursor:
-            books.append(BookResponse(
-                id=str(book_doc["_id"]),
-                title=book_doc["title"],
-                author=book_doc["author"],
-                genre=book_doc["genre"],
-                total_copies=book_doc["total_copies"],
-                available_copies=book_doc["available_copies"]
-            ))
+        # Match the batch to the limit so the whole page arrives in one batch
+        cursor = self.books_collection.find(
+            {},
+            projection=BOOK_PROJECTION
+        ).batch_size(limit).limit(limit)
         
-        return books
+        return [
+            {
+                "id": str(book_doc["_id"]),
+                "title": book_doc["title"],
+                "author": book_doc["author"],
+                "genre": book_doc["genre"],
+                "total_copies": book_doc["total_copies"],
+                "available_copies": book_doc["available_copies"]
+            }
+            for book_doc in await cursor.to_list(length=limit)
+        ]
     
     async def update_available_copies(
         self, 
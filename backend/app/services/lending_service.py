@@ -1,18 +1,26 @@
 from typing import List
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
 
 from app.models.lending_model import LendingModel, LendingStatus
 from app.schemas.lending_schema import (
     LendBookRequest, 
-    LendingResponse, 
-    LendingWithBookResponse,
-    UserDashboardResponse
+    LendingResponse
 )
-from app.services.book_service import BookService
-from app.schemas.book_schema import BookResponse
+
+# Stored status values, resolved once instead of per query
+_ACTIVE = LendingStatus.ACTIVE.value
+_RESERVED = LendingStatus.RESERVED.value
+_RETURNED = LendingStatus.RETURNED.value
+
+
+def _today() -> datetime:
+    """Local midnight today; lending dates are stored at midnight."""
+    return datetime.combine(datetime.now().date(), time.min)
 
 
 class LendingService:
@@ -22,70 +30,74 @@ class LendingService:
         self.db = db
         self.lendings_collection = db.lendings
         self.books_collection = db.books
-        self.book_service = BookService(db)
     
     async def lend_book(self, user_id: str, lend_request: LendBookRequest) -> LendingResponse:
         
-        # Fetch book
-        book = await self.book_service.get_book_by_id(lend_request.book_id)
-        
         # Parse start date (if advance lending)
         start_date = None
         if lend_request.start_date:
-            try:
-                start_date = datetime.fromisoformat(lend_request.start_date)
-                start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid start_date format. Use YYYY-MM-DD"
-                )
+            start_date = datetime.combine(lend_request.start_date, time.min)
         
         # Determine if immediate or advance lending
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today = _today()
         is_immediate = start_date is None or start_date <= today
         
         if is_immediate:
             # IMMEDIATE LENDING
-            return await self._immediate_lending(user_id, book, lend_request.duration_days)
+            return await self._immediate_lending(user_id, lend_request.book_id, today, lend_request.duration_days)
         else:
             # ADVANCE LENDING
-            return await self._advance_lending(user_id, book, start_date, lend_request.duration_days)
+            return await self._advance_lending(user_id, lend_request.book_id, start_date, today, lend_request.duration_days)
     
     async def _immediate_lending(
         self, 
         user_id: str, 
-        book: BookResponse, 
+        book_id: str, 
+        today: datetime,
         duration_days: int
     ) -> LendingResponse:
-        # Atomically decrement available_copies only if > 0
-        updated_book_doc = await self.books_collection.find_one_and_update(
+        try:
+            book_oid = ObjectId(book_id)
+        except (InvalidId, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Invalid book ID"
+            )
+        
+        # Atomically decrement available_copies only if > 0, reading the
+        # title back in the same round-trip
+        book_doc = await self.books_collection.find_one_and_update(
             {
-                "_id": ObjectId(book.id),
+                "_id": book_oid,
                 "available_copies": {"$gt": 0},
             },
             {"$inc": {"available_copies": -1}},
-            return_document=False,  # we only need to know if a doc was matched
+            projection={"title": 1},
+            return_document=ReturnDocument.AFTER,
         )
 
-        if not updated_book_doc:
-            # Another user took the last copy just before this request
+        if not book_doc:
+            # Either the book doesn't exist or another user took the last copy
+            if not await self.books_collection.find_one({"_id": book_oid}, projection={"_id": 1}):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Book not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Book is not currently available. Use advance lending to reserve.",
             )
 
         # Calculate dates
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         return_date = today + timedelta(days=duration_days)
         
         # Create lending record
         lending_model = LendingModel(
             user_id=user_id,
-            book_id=book.id,
+            book_id=str(book_oid),
             lend_start_date=today,
             lend_end_date=return_date,
-            status=LendingStatus.ACTIVE
+            status=_ACTIVE
         )
         
         # Insert lending record into database
@@ -93,33 +105,69 @@ class LendingService:
             lending_model.model_dump(by_alias=True, exclude={"id"})
         )
         
-        # Fetch created lending
-        created_lending = await self.lendings_collection.find_one(
-            {"_id": result.inserted_id}
-        )
-        
-        return LendingResponse(
-            id=str(created_lending["_id"]),
-            user_id=created_lending["user_id"],
-            book_id=created_lending["book_id"],
-            book_title=book.title,
-            lend_start_date=created_lending["lend_start_date"].isoformat(),
-            lend_end_date=created_lending["lend_end_date"].isoformat(),
+        # Build the response from what was just written, no refetch
+        return LendingResponse.model_construct(
+            id=str(result.inserted_id),
+            user_id=lending_model.user_id,
+            book_id=lending_model.book_id,
+            book_title=book_doc["title"],
+            lend_start_date=lending_model.lend_start_date,
+            lend_end_date=lending_model.lend_end_date,
             actual_return_date=None,
-            status=created_lending["status"],
-            created_at=created_lending["created_at"].isoformat()
+            status=lending_model.status,
+            created_at=lending_model.created_at
         )
     
     async def _advance_lending(
         self, 
         user_id: str, 
-        book: BookResponse, 
+        book_id: str, 
         start_date: datetime,
+        today: datetime,
         duration_days: int
     ) -> LendingResponse:
+        try:
+            book_oid = ObjectId(book_id)
+        except (InvalidId, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Invalid book ID"
+            )
+        book_id = str(book_oid)
         
+        # Fetch the book, its earliest active lending and any existing
+        # reservation in one round-trip
+        cursor = self.books_collection.aggregate([
+            {"$match": {"_id": book_oid}},
+            {"$lookup": {
+                "from": "lendings",
+                "pipeline": [
+                    {"$match": {"book_id": book_id, "status": _ACTIVE}},
+                    {"$sort": {"lend_end_date": 1}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "lend_end_date": 1}}
+                ],
+                "as": "earliest_active"
+            }},
+            {"$lookup": {
+                "from": "lendings",
+                "pipeline": [
+                    {"$match": {"book_id": book_id, "status": _RESERVED}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "lend_start_date": 1}}
+                ],
+                "as": "reservation"
+            }},
+            {"$project": {"title": 1, "earliest_active": 1, "reservation": 1}}
+        ])
+        docs = await cursor.to_list(length=1)
         
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if not docs:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book not found"
+            )
+        book_doc = docs[0]
         
         # Validate start date is in future
         if start_date <= today:
@@ -128,19 +176,9 @@ class LendingService:
                 detail="Start date must be in the future for advance lending"
             )
         
-        # Find earliest return date from active lendings
-        earliest_active = await self.lendings_collection.find_one(
-            {
-                "book_id": book.id,
-                "status": LendingStatus.ACTIVE.value
-            },
-            sort=[("lend_end_date", 1)]
-        )
-        
-        if earliest_active:
-            earliest_return = earliest_active["lend_end_date"].replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
+        if book_doc["earliest_active"]:
+            # Already midnight: end dates are start dates plus whole days
+            earliest_return = book_doc["earliest_active"][0]["lend_end_date"]
             
             # start_date must be >= return date of current lending
             if start_date < earliest_return:
@@ -150,16 +188,9 @@ class LendingService:
                            f"Please select {earliest_return.date()} or later."
                 )
         
-        # Check if there's already a reservation
-        existing_reservation = await self.lendings_collection.find_one(
-            {
-                "book_id": book.id,
-                "status": LendingStatus.RESERVED.value
-            }
-        )
-        
-        if existing_reservation:
-            reserved_start = existing_reservation["lend_start_date"].date()
+        # Only one reservation per book
+        if book_doc["reservation"]:
+            reserved_start = book_doc["reservation"][0]["lend_start_date"].date()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Book is already reserved starting {reserved_start}. "
@@ -172,10 +203,10 @@ class LendingService:
         # Create reserved lending record
         lending_model = LendingModel(
             user_id=user_id,
-            book_id=book.id,
+            book_id=book_id,
             lend_start_date=start_date,
             lend_end_date=return_date,
-            status=LendingStatus.RESERVED
+            status=_RESERVED
         )
         
         # Insert into database
@@ -185,85 +216,76 @@ class LendingService:
         
         # DO NOT decrease available_copies yet (done when reservation activates)
         
-        # Fetch created lending
-        created_lending = await self.lendings_collection.find_one(
-            {"_id": result.inserted_id}
-        )
-        
-        return LendingResponse(
-            id=str(created_lending["_id"]),
-            user_id=created_lending["user_id"],
-            book_id=created_lending["book_id"],
-            book_title=book.title,
-            lend_start_date=created_lending["lend_start_date"].isoformat(),
-            lend_end_date=created_lending["lend_end_date"].isoformat(),
+        # Build the response from what was just written, no refetch
+        return LendingResponse.model_construct(
+            id=str(result.inserted_id),
+            user_id=lending_model.user_id,
+            book_id=lending_model.book_id,
+            book_title=book_doc["title"],
+            lend_start_date=lending_model.lend_start_date,
+            lend_end_date=lending_model.lend_end_date,
             actual_return_date=None,
-            status=created_lending["status"],
-            created_at=created_lending["created_at"].isoformat()
+            status=lending_model.status,
+            created_at=lending_model.created_at
         )
     
-    async def get_user_dashboard(self, user_id: str) -> UserDashboardResponse:
-        
-        # Fetch all user lendings
-        cursor = self.lendings_collection.find({"user_id": user_id})
+    def _dashboard_arm(self, lending_status: str) -> list:
+        """$facet arm: lendings with one status, joined to their book and shaped for the response."""
+        return [
+            {"$match": {"status": lending_status}},
+            {"$lookup": {
+                "from": "books",
+                "localField": "_book_oid",
+                "foreignField": "_id",
+                "as": "book"
+            }},
+            {"$unwind": "$book"},
+            {"$project": {
+                "_id": 0,
+                "id": {"$toString": "$_id"},
+                "book": {
+                    "id": {"$toString": "$book._id"},
+                    "title": "$book.title",
+                    "author": "$book.author",
+                    "genre": "$book.genre",
+                    "total_copies": "$book.total_copies",
+                    "available_copies": "$book.available_copies"
+                },
+                "lend_start_date": "$lend_start_date",
+                "lend_end_date": "$lend_end_date",
+                "actual_return_date": {"$ifNull": ["$actual_return_date", None]},
+                "status": "$status",
+                "created_at": "$created_at"
+            }}
+        ]
+    
+    async def get_user_dashboard(self, user_id: str) -> dict:
+        """Dashboard payload shaped like UserDashboardResponse, as plain dicts."""
         
-        active_lendings = []
-        reserved_lendings = []
-        lending_history = []
-        total_count = 0
+        # Bucket, join and shape all user lendings server-side in one round-trip.
+        # The total counts every lending, including ones whose book is gone.
+        cursor = self.lendings_collection.aggregate([
+            {"$match": {"user_id": user_id}},
+            {"$addFields": {"_book_oid": {"$toObjectId": "$book_id"}}},
+            {"$facet": {
+                "active_lendings": self._dashboard_arm(_ACTIVE),
+                "reserved_lendings": self._dashboard_arm(_RESERVED),
+                "lending_history": self._dashboard_arm(_RETURNED),
+                "total": [{"$count": "n"}]
+            }}
+        ])
+        result = (await cursor.to_list(length=1))[0]
         
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        total = result.pop("total")
+        result["total_books_borrowed"] = total[0]["n"] if total else 0
         
-        async for lending_doc in cursor:
-            total_count += 1
-            
-            # Fetch book details
-            book_doc = await self.books_collection.find_one(
-                {"_id": ObjectId(lending_doc["book_id"])}
-            )
-            
-            if not book_doc:
-                continue
-            
-            book = BookResponse(
-                id=str(book_doc["_id"]),
-                title=book_doc["title"],
-                author=book_doc["author"],
-                genre=book_doc["genre"],
-                total_copies=book_doc["total_copies"],
-                available_copies=book_doc["available_copies"]
-            )
-            
-            # Calculate days remaining
-            end_date = lending_doc["lend_end_date"].replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            days_remaining = (end_date - today).days
-            is_overdue = days_remaining < 0 and lending_doc["status"] == LendingStatus.ACTIVE.value
-            
-            lending_response = LendingWithBookResponse(
-                id=str(lending_doc["_id"]),
-                book=book,
-                lend_start_date=lending_doc["lend_start_date"].isoformat(),
-                lend_end_date=lending_doc["lend_end_date"].isoformat(),
-                actual_return_date=lending_doc.get("actual_return_date"),
-                status=lending_doc["status"],
-                created_at=lending_doc["created_at"].isoformat(),
-                days_remaining=days_remaining if days_remaining >= 0 else None,
-                is_overdue=is_overdue
-            )
-            
-            # Categorize
-            if lending_doc["status"] == LendingStatus.ACTIVE.value:
-                active_lendings.append(lending_response)
-            elif lending_doc["status"] == LendingStatus.RESERVED.value:
-                reserved_lendings.append(lending_response)
-            elif lending_doc["status"] == LendingStatus.RETURNED.value:
-                lending_history.append(lending_response)
+        # Day arithmetic stays here so the pipeline runs without $dateDiff (MongoDB 5.0+)
+        today = _today()
+        for key in ("active_lendings", "reserved_lendings", "lending_history"):
+            for lending in result[key]:
+                end_date = datetime.combine(lending["lend_end_date"].date(), time.min)
+                days_remaining = (end_date - today).days
+                lending["days_remaining"] = days_remaining if days_remaining >= 0 else None
+                lending["is_overdue"] = days_remaining < 0 and lending["status"] == _ACTIVE
         
-        return UserDashboardResponse(
-            active_lendings=active_lendings,
-            reserved_lendings=reserved_lendings,
-            lending_history=lending_history,
-            total_books_borrowed=total_count
-        )
\ No newline at end of file
+        return result
\ No newline at end of file
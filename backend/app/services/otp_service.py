@@ -3,12 +3,14 @@ OTP service for generating and validating OTPs.
 Uses static OTP "123456" for testing.
 """
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import InsertOne, ReturnDocument, UpdateMany
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 from app.models.otp_model import OTPModel, OTPPurpose
+from app.utils.time_utils import utc_now
 
 
 class OTPService:
@@ -48,33 +50,39 @@ class OTPService:
             - Not return the code (security)
         """
         
-        # Invalidate existing OTPs for this email+purpose
-        await self.otp_collection.update_many(
-            {
-                "email": email.lower(),
-                "purpose": purpose.value,
-                "is_used": False
-            },
-            {"$set": {"is_used": True}}
-        )
-        
         # Generate OTP (static for testing)
         otp_code = settings.STATIC_OTP
         
         # Calculate expiry
-        expires_at = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
+        expires_at = utc_now() + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
+        
+        email_l = email.lower()
         
         # Create OTP record
         otp_model = OTPModel(
-            email=email.lower(),
+            email=email_l,
             otp_code=otp_code,
-            purpose=purpose,
+            purpose=purpose.value,
             expires_at=expires_at
         )
         
-        # Store in database
-        await self.otp_collection.insert_one(
-            otp_model.model_dump(by_alias=True, exclude={"id"})
+        # Invalidate existing OTPs for this email+purpose and store the new
+        # one in a single round-trip. Must stay ordered: unordered, the
+        # server may run the insert first and the update would then
+        # invalidate the OTP it just stored.
+        await self.otp_collection.bulk_write(
+            [
+                UpdateMany(
+                    {
+                        "email": email_l,
+                        "purpose": purpose.value,
+                        "is_used": False
+                    },
+                    {"$set": {"is_used": True}}
+                ),
+                InsertOne(otp_model.model_dump(by_alias=True, exclude={"id"}))
+            ],
+            ordered=True
         )
         
         # In production: Send email here
@@ -105,66 +113,77 @@ class OTPService:
             HTTPException 400: If OTP invalid, expired, or too many attempts
         """
         
-        # Find latest unused OTP for this email+purpose
-        otp_record = await self.otp_collection.find_one(
+        email_l = email.lower()
+        
+        # Count the attempt and consume the OTP on a match in one atomic
+        # write, so concurrent guesses cannot exceed the attempt limit
+        otp_record = await self.otp_collection.find_one_and_update(
             {
-                "email": email.lower(),
+                "email": email_l,
                 "purpose": purpose.value,
-                "is_used": False
+                "is_used": False,
+                "expires_at": {"$gte": utc_now()},
+                "attempts": {"$lt": 3}
             },
-            sort=[("created_at", -1)]  # Get latest
+            # $literal keeps a submitted code like "$otp_code" from being
+            # read as a field path inside the pipeline
+            [{"$set": {
+                "attempts": {"$add": ["$attempts", 1]},
+                "is_used": {"$eq": ["$otp_code", {"$literal": otp_code}]}
+            }}],
+            projection={"attempts": 1, "is_used": 1},
+            sort=[("created_at", -1)],  # Get latest
+            return_document=ReturnDocument.AFTER
         )
         
         if not otp_record:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No valid OTP found. Please request a new OTP."
-            )
+            # Work out why nothing matched; only failed verifications pay this read
+            await self._raise_unusable_otp(email_l, purpose)
         
-        # Check expiry
-        if datetime.utcnow() > otp_record["expires_at"]:
+        # Verify OTP code
+        if not otp_record["is_used"]:
+            attempts_left = 3 - otp_record["attempts"]
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="OTP has expired. Please request a new OTP."
+                detail=f"Invalid OTP. {attempts_left} attempts remaining."
             )
         
-        # Check attempts
-        if otp_record["attempts"] >= 3:
-            # Mark as used to prevent further attempts
-            await self.otp_collection.update_one(
-                {"_id": otp_record["_id"]},
-                {"$set": {"is_used": True}}
-            )
+        return True
+    
+    async def _raise_unusable_otp(self, email: str, purpose: OTPPurpose) -> None:
+        """Raise the error explaining why no OTP could be verified."""
+        otp_record = await self.otp_collection.find_one(
+            {
+                "email": email,
+                "purpose": purpose.value,
+                "is_used": False
+            },
+            projection={"expires_at": 1, "attempts": 1},
+            sort=[("created_at", -1)]
+        )
+        
+        # Missing, or consumed by a concurrent request since the update ran
+        if not otp_record or (
+            otp_record["attempts"] < 3 and utc_now() <= otp_record["expires_at"]
+        ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Too many failed attempts. Please request a new OTP."
+                detail="No valid OTP found. Please request a new OTP."
             )
         
-        # Increment attempts
-        await self.otp_collection.update_one(
-            {"_id": otp_record["_id"]},
-            {"$inc": {"attempts": 1}}
-        )
-        
-        # Verify OTP code
-        if otp_record["otp_code"] != otp_code:
-            attempts_left = 3 - (otp_record["attempts"] + 1)
+        # Check expiry
+        if utc_now() > otp_record["expires_at"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid OTP. {attempts_left} attempts remaining."
+                detail="OTP has expired. Please request a new OTP."
             )
         
-        # Mark OTP as used
+        # Out of attempts: mark as used to prevent further attempts
         await self.otp_collection.update_one(
             {"_id": otp_record["_id"]},
             {"$set": {"is_used": True}}
         )
-        
-        return True
-    
-    async def cleanup_expired_otps(self) -> int:
-        
-        result = await self.otp_collection.delete_many(
-            {"expires_at": {"$lt": datetime.utcnow()}}
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Too many failed attempts. Please request a new OTP."
         )
-        return result.deleted_count
\ No newline at end of file
@@ -1,12 +1,14 @@
 import hashlib
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Tuple, Optional
+from pymongo import InsertOne, UpdateOne
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status
 
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token, decode_token, verify_token_type
+from app.core.security import REFRESH_TOKEN_TYPE, create_access_token, create_refresh_token, decode_token
 from app.models.refresh_token_model import RefreshTokenModel
+from app.utils.time_utils import utc_now
 
 
 class TokenService:
@@ -16,18 +18,30 @@ class TokenService:
         self.refresh_tokens_collection = db.refresh_tokens
     
     def _hash_token(self, token: str) -> str:
-        
+        """BLAKE2b-256 digest of the token, used as its lookup key."""
+        return hashlib.blake2b(token.encode(), digest_size=32).hexdigest()
+    
+    def _legacy_hash_token(self, token: str) -> str:
+        """SHA-256 digest stored by earlier releases."""
         return hashlib.sha256(token.encode()).hexdigest()
     
-    async def create_tokens(self, user_id: str, device_info: Optional[str] = None) -> Tuple[str, str]:
-        
+    def _token_hash_filter(self, token: str) -> dict:
+        """
+        Match either digest so tokens issued before the switch keep working.
+        
+        Legacy tokens are replaced by BLAKE2b ones on their first refresh, so
+        the SHA-256 branch can go once no live document lacks hash_algo.
+        """
+        return {"$in": [self._hash_token(token), self._legacy_hash_token(token)]}
+    
+    def _issue_tokens(self, user_id: str, device_info: Optional[str] = None) -> Tuple[str, str, dict]:
+        """Create an access/refresh pair and the refresh token document to store."""
         access_token = create_access_token(data={"sub": user_id})
         refresh_token = create_refresh_token(data={"sub": user_id})
         
         # Calculate refresh token expiry
-        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expires_at = utc_now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         
-        # Store refresh token hash in database
         refresh_token_model = RefreshTokenModel(
             user_id=user_id,
             token_hash=self._hash_token(refresh_token),
@@ -35,26 +49,31 @@ class TokenService:
             device_info=device_info
         )
         
-        await self.refresh_tokens_collection.insert_one(
-            refresh_token_model.model_dump(by_alias=True, exclude={"id"})
-        )
+        return access_token, refresh_token, refresh_token_model.model_dump(by_alias=True, exclude={"id"})
+    
+    async def create_tokens(self, user_id: str, device_info: Optional[str] = None) -> Tuple[str, str]:
+        
+        access_token, refresh_token, token_doc = self._issue_tokens(user_id, device_info)
+        
+        # Store refresh token hash in database
+        await self.refresh_tokens_collection.insert_one(token_doc)
         
         return access_token, refresh_token
     
     async def refresh_access_token(self, refresh_token: str) -> Tuple[str, str]:
 
-        if not verify_token_type(refresh_token, "refresh"):
+        # Decode (and verify) once, then check the type claim on the payload
+        payload = decode_token(refresh_token)
+        if not payload:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type. Expected refresh token."
+                detail="Invalid or expired refresh token."
             )
         
-        # Decode token
-        payload = decode_token(refresh_token)
-        if not payload:
+        if payload.get("type") != REFRESH_TOKEN_TYPE:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired refresh token."
+                detail="Invalid token type. Expected refresh token."
             )
         
         user_id = payload.get("sub")
@@ -65,9 +84,8 @@ class TokenService:
             )
         
         # Check token exists in database and not revoked
-        token_hash = self._hash_token(refresh_token)
         stored_token = await self.refresh_tokens_collection.find_one({
-            "token_hash": token_hash,
+            "token_hash": self._token_hash_filter(refresh_token),
             "user_id": user_id,
             "is_revoked": False
         })
@@ -79,7 +97,7 @@ class TokenService:
             )
         
         # Check expiry
-        if datetime.utcnow() > stored_token["expires_at"]:
+        if utc_now() > stored_token["expires_at"]:
             # Revoke expired token
             await self.refresh_tokens_collection.update_one(
                 {"_id": stored_token["_id"]},
@@ -90,27 +108,34 @@ class TokenService:
                 detail="Refresh token expired. Please login again."
             )
         
-        # Revoke old refresh token
-        await self.refresh_tokens_collection.update_one(
-            {"_id": stored_token["_id"]},
-            {"$set": {"is_revoked": True}}
-        )
-        
         # Generate new tokens
-        new_access_token, new_refresh_token = await self.create_tokens(
+        new_access_token, new_refresh_token, token_doc = self._issue_tokens(
             user_id=user_id,
             device_info=stored_token.get("device_info")
         )
         
+        # Revoke old refresh token and store the new one in one round-trip
+        await self.refresh_tokens_collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": stored_token["_id"]},
+                    {"$set": {"is_revoked": True}}
+                ),
+                InsertOne(token_doc)
+            ],
+            ordered=True
+        )
+        
         return new_access_token, new_refresh_token
     
     async def revoke_token(self, refresh_token: str) -> bool:
         
         
-        token_hash = self._hash_token(refresh_token)
-        
         result = await self.refresh_tokens_collection.update_one(
-            {"token_hash": token_hash},
+            {
+                "token_hash": self._token_hash_filter(refresh_token),
+                "is_revoked": False
+            },
             {"$set": {"is_revoked": True}}
         )
         
@@ -127,11 +152,3 @@ class TokenService:
         )
         
         return result.modified_count
-    
-    async def cleanup_expired_tokens(self) -> int:
-        
-        result = await self.refresh_tokens_collection.delete_many({
-            "expires_at": {"$lt": datetime.utcnow()}
-        })
-        
-        return result.deleted_count
\ No newline at end of file
@@ -0,0 +1,66 @@
+import hashlib
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after ``ttl`` seconds.
+
+    When full, the oldest entry is evicted. Each worker process keeps its
+    own copy, so cached values may be up to ``ttl`` seconds stale.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data.pop(key, None)
+        while len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (value, monotonic() + (self.ttl if ttl is None else ttl))
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Authenticated user profiles keyed by user ID (JWT "sub"). Updates and
+# evictions only reach the worker that made them; every other worker may
+# serve the old profile for up to USER_CACHE_TTL_SECONDS.
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# Verified access tokens: token digest -> user ID, so repeat requests skip JWT
+# verification. Access tokens are stateless until "exp": logout and password
+# reset revoke refresh tokens only, so there is nothing to evict here, and an
+# entry never outlives its token. Account state comes from user_cache.
+token_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def token_digest(token: str) -> bytes:
+    """Short cache key for a token, so raw tokens are not kept in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
@@ -1,88 +1,111 @@
-from fastapi import Depends, HTTPException, status
+from time import time
+from types import MappingProxyType
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.db.mongo import get_database
-from app.core.security import decode_token, verify_token_type
+from app.core.security import ACCESS_TOKEN_TYPE, decode_and_check_type
 from app.services.auth_service import AuthService
 from app.services.book_service import BookService
 from app.services.lending_service import LendingService
+from app.services.otp_service import OTPService
 from app.services.token_service import TokenService
 from app.schemas.user_schema import UserResponse
+from app.utils.cache import token_cache, token_digest, user_cache
 
 
 
-security = HTTPBearer()
+# Missing credentials are reported by get_current_user as a 401
+security = HTTPBearer(auto_error=False)
 
-def get_auth_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> AuthService:
-    """Dependency for auth service injection."""
-    return AuthService(db)
+# Read-only, so the one instance can be shared by every 401
+_UNAUTH_HEADERS = MappingProxyType({"WWW-Authenticate": "Bearer"})
 
-def get_book_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> BookService:
-    """Dependency for book service injection."""
-    return BookService(db)
+_NOT_AUTHENTICATED = "Not authenticated"
+_BAD_TOKEN = "Invalid or expired token. Please refresh or login again."
+_BAD_PAYLOAD = "Invalid token payload."
+_USER_NOT_FOUND = "User not found. Please login again."
+_INACTIVE = "Account is inactive or suspended."
 
-def get_lending_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> LendingService:
-    """Dependency for lending service injection."""
-    return LendingService(db)
+def _unauth(detail: str) -> HTTPException:
+    """401 carrying the Bearer challenge header."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_UNAUTH_HEADERS
+    )
 
-def get_token_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> TokenService:
-    """Dependency for token service injection."""
-    return TokenService(db)
+def get_otp_service(request: Request) -> OTPService:
+    """Dependency for the app-wide OTP service."""
+    return request.app.state.otp_service
+
+def get_token_service(request: Request) -> TokenService:
+    """Dependency for the app-wide token service."""
+    return request.app.state.token_service
+
+def get_auth_service(request: Request) -> AuthService:
+    """Dependency for the app-wide auth service."""
+    return request.app.state.auth_service
+
+def get_book_service(request: Request) -> BookService:
+    """Dependency for the app-wide book service."""
+    return request.app.state.book_service
+
+def get_lending_service(request: Request) -> LendingService:
+    """Dependency for the app-wide lending service."""
+    return request.app.state.lending_service
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> UserResponse:
     
+    if credentials is None:
+        raise _unauth(_NOT_AUTHENTICATED)
+    
     token = credentials.credentials
+    digest = token_digest(token)
     
-    # Verify token type
-    if not verify_token_type(token, "access"):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token type. Expected access token.",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+    # Tokens verified recently map straight to their user ID
+    user_id = token_cache.get(digest)
+    if user_id is None:
+        # Verify signature, expiry and token type in one decode
+        payload = decode_and_check_type(token, ACCESS_TOKEN_TYPE)
+        if not payload:
+            raise _unauth(_BAD_TOKEN)
+        
+        # Extract user_id
+        user_id = payload.get("sub")
+        if not user_id:
+            raise _unauth(_BAD_PAYLOAD)
+        
+        # Never keep a token cached past its own expiry
+        token_cache.set(digest, user_id, ttl=min(token_cache.ttl, payload["exp"] - time()))
     
-    # Decode token
-    payload = decode_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token. Please refresh or login again.",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+    # Serve warm users from the cache, otherwise fetch and cache
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = await auth_service.get_user_by_id(user_id)
+        except HTTPException as e:
+            # A malformed "sub" is a bad credential and a deleted user means the
+            # token is stale; anything else propagates as-is
+            if e.status_code == status.HTTP_400_BAD_REQUEST:
+                raise _unauth(_BAD_PAYLOAD) from e
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                raise _unauth(_USER_NOT_FOUND) from e
+            raise
+        user_cache.set(user_id, user)
     
-    # Extract user_id
-    user_id: str = payload.get("sub")
-    if not user_id:
+    # Checked here rather than in a second dependency layer
+    if not user.is_active:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload.",
-            headers={"WWW-Authenticate": "Bearer"}
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=_INACTIVE
         )
     
-    # Fetch user
-    try:
-        user = await auth_service.get_user_by_id(user_id)
-        return user
-    except HTTPException:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found. Please login again.",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+    return user
 
 
-async def get_current_active_user(
-    current_user: UserResponse = Depends(get_current_user)
-) -> UserResponse:
-    
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Account is inactive or suspended."
-        )
-    
-    return current_user
\ No newline at end of file
+# get_current_user already rejects inactive accounts
+get_current_active_user = get_current_user
@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """
+    Current UTC time as a naive datetime.
+    
+    Replaces the deprecated datetime.utcnow(). Stays naive so values match
+    what Motor returns when reading dates back from MongoDB.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
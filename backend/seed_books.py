@@ -1,7 +1,9 @@
 
-import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
-from datetime import datetime
+import argparse
+import sys
+from typing import List, Optional
+from pymongo import MongoClient, UpdateOne
+from datetime import datetime, timezone
 
 
 # MongoDB connection (adjust if needed)
@@ -10,195 +12,108 @@ DATABASE_NAME = "Library_System"
 
 
 # Sample books data - 20 diverse books across genres
-SAMPLE_BOOKS = [
+# (title, author, genre, copies); every copy starts out available
+SAMPLE_BOOK_ROWS = (
     # Classic Fiction
-    {
-        "title": "The Great Gatsby",
-        "author": "F. Scott Fitzgerald",
-        "genre": "Classic Fiction",
-        "total_copies": 5,
-        "available_copies": 5
-    },
-    {
-        "title": "To Kill a Mockingbird",
-        "author": "Harper Lee",
-        "genre": "Classic Fiction",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    {
-        "title": "1984",
-        "author": "George Orwell",
-        "genre": "Classic Fiction",
-        "total_copies": 6,
-        "available_copies": 6,
-    },
-    {
-        "title": "Pride and Prejudice",
-        "author": "Jane Austen",
-        "genre": "Classic Fiction",
-        "total_copies": 3,
-        "available_copies": 3
-    },
-    
+    ("The Great Gatsby", "F. Scott Fitzgerald", "Classic Fiction", 5),
+    ("To Kill a Mockingbird", "Harper Lee", "Classic Fiction", 4),
+    ("1984", "George Orwell", "Classic Fiction", 6),
+    ("Pride and Prejudice", "Jane Austen", "Classic Fiction", 3),
     # Science Fiction
-    {
-        "title": "Dune",
-        "author": "Frank Herbert",
-        "genre": "Science Fiction",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    {
-        "title": "The Martian",
-        "author": "Andy Weir",
-        "genre": "Science Fiction",
-        "total_copies": 5,
-        "available_copies": 5
-    },
-    {
-        "title": "Neuromancer",
-        "author": "William Gibson",
-        "genre": "Science Fiction",
-        "total_copies": 3,
-        "available_copies": 3
-    },
-    {
-        "title": "Foundation",
-        "author": "Isaac Asimov",
-        "genre": "Science Fiction",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    
+    ("Dune", "Frank Herbert", "Science Fiction", 4),
+    ("The Martian", "Andy Weir", "Science Fiction", 5),
+    ("Neuromancer", "William Gibson", "Science Fiction", 3),
+    ("Foundation", "Isaac Asimov", "Science Fiction", 4),
     # Fantasy
-    {
-        "title": "The Hobbit",
-        "author": "J.R.R. Tolkien",
-        "genre": "Fantasy",
-        "total_copies": 6,
-        "available_copies": 6
-    },
-    {
-        "title": "Harry Potter and the Sorcerer's Stone",
-        "author": "J.K. Rowling",
-        "genre": "Fantasy",
-        "total_copies": 8,
-        "available_copies": 8
-    },
-    {
-        "title": "The Name of the Wind",
-        "author": "Patrick Rothfuss",
-        "genre": "Fantasy",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    
+    ("The Hobbit", "J.R.R. Tolkien", "Fantasy", 6),
+    ("Harry Potter and the Sorcerer's Stone", "J.K. Rowling", "Fantasy", 8),
+    ("The Name of the Wind", "Patrick Rothfuss", "Fantasy", 4),
     # Mystery/Thriller
-    {
-        "title": "The Girl with the Dragon Tattoo",
-        "author": "Stieg Larsson",
-        "genre": "Mystery",
-        "total_copies": 5,
-        "available_copies": 5
-    },
-    {
-        "title": "Gone Girl",
-        "author": "Gillian Flynn",
-        "genre": "Thriller",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    {
-        "title": "The Da Vinci Code",
-        "author": "Dan Brown",
-        "genre": "Mystery",
-        "total_copies": 5,
-        "available_copies": 5
-    },
-    
+    ("The Girl with the Dragon Tattoo", "Stieg Larsson", "Mystery", 5),
+    ("Gone Girl", "Gillian Flynn", "Thriller", 4),
+    ("The Da Vinci Code", "Dan Brown", "Mystery", 5),
     # Non-Fiction
-    {
-        "title": "Sapiens: A Brief History of Humankind",
-        "author": "Yuval Noah Harari",
-        "genre": "Non-Fiction",
-        "total_copies": 6,
-        "available_copies": 6
-    },
-    {
-        "title": "Educated",
-        "author": "Tara Westover",
-        "genre": "Biography",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    {
-        "title": "Atomic Habits",
-        "author": "James Clear",
-        "genre": "Self-Help",
-        "total_copies": 7,
-        "available_copies": 7
-    },
-    
+    ("Sapiens: A Brief History of Humankind", "Yuval Noah Harari", "Non-Fiction", 6),
+    ("Educated", "Tara Westover", "Biography", 4),
+    ("Atomic Habits", "James Clear", "Self-Help", 7),
     # Contemporary Fiction
-    {
-        "title": "The Kite Runner",
-        "author": "Khaled Hosseini",
-        "genre": "Contemporary Fiction",
-        "total_copies": 4,
-        "available_copies": 4
-    },
-    {
-        "title": "The Alchemist",
-        "author": "Paulo Coelho",
-        "genre": "Contemporary Fiction",
-        "total_copies": 5,
-        "available_copies": 5
-    },
-    {
-        "title": "Life of Pi",
-        "author": "Yann Martel",
-        "genre": "Contemporary Fiction",
-        "total_copies": 3,
-        "available_copies": 3
-    }
-]
+    ("The Kite Runner", "Khaled Hosseini", "Contemporary Fiction", 4),
+    ("The Alchemist", "Paulo Coelho", "Contemporary Fiction", 5),
+    ("Life of Pi", "Yann Martel", "Contemporary Fiction", 3),
+)
+
 
+def build_seed_operations() -> List[UpdateOne]:
+    """
+    Expand the sample rows into upserts, once per run.
+    
+    Upserts are keyed on title+author so re-running only adds books that
+    are missing.
+    """
+    seeded_at = datetime.now(timezone.utc)
+    return [
+        UpdateOne(
+            {"title": title, "author": author},
+            {"$setOnInsert": {
+                "title": title,
+                "author": author,
+                "genre": genre,
+                "total_copies": copies,
+                "available_copies": copies,
+                "created_at": seeded_at
+            }},
+            upsert=True
+        )
+        for title, author, genre, copies in SAMPLE_BOOK_ROWS
+    ]
 
-async def seed_books():
+
+def seed_books(force: Optional[bool] = None):
     """
     Seed the database with sample books.
+    
+    Args:
+        force: True seeds even if books exist, False skips in that case,
+            None asks (or skips when stdin is not a terminal).
     """
     
     print(" Starting book seeding process...")
     
-    # Connect to MongoDB
-    client = AsyncIOMotorClient(MONGODB_URL)
+    # Connect to MongoDB (a one-off script gains nothing from Motor's async wrapper)
+    client = MongoClient(MONGODB_URL)
     db = client[DATABASE_NAME]
     books_collection = db.books
     
     try:
-        # Check if books already exist
-        existing_count = await books_collection.count_documents({})
+        # Check if books already exist (metadata count, no scan)
+        existing_count = books_collection.estimated_document_count()
         
         if existing_count > 0:
             print(f"  Database already contains {existing_count} books.")
-            response = input("Do you want to add more books anyway? (y/n): ")
-            if response.lower() != 'y':
+            if force is None:
+                force = sys.stdin.isatty() and input(
+                    "Do you want to add more books anyway? (y/n): "
+                ).lower() == 'y'
+            if not force:
                 print(" Seeding cancelled.")
                 return
         
         # Insert sample books
-        print(f" Inserting {len(SAMPLE_BOOKS)} books...")
-        result = await books_collection.insert_many(SAMPLE_BOOKS)
+        print(f" Inserting {len(SAMPLE_BOOK_ROWS)} books...")
+        result = books_collection.bulk_write(build_seed_operations(), ordered=False)
+        inserted = result.upserted_count
         
-        print(f" Successfully inserted {len(result.inserted_ids)} books!")
-        print("\n Sample books added:")
-        for i, book in enumerate(SAMPLE_BOOKS, 1):
-            print(f"   {i}. {book['title']} by {book['author']} ({book['genre']})")
+        print(f" Successfully inserted {inserted} books!")
+        # upserted_ids is keyed by operation index, which is the row index
+        added = [SAMPLE_BOOK_ROWS[i] for i in sorted(result.upserted_ids)]
+        if added:
+            print("\n Sample books added:\n" + "\n".join(
+                f"   {n}. {title} by {author} ({genre})"
+                for n, (title, author, genre, _) in enumerate(added, 1)
+            ))
         
         print("\n  Database seeding complete!")
-        print(f" Total books in database: {await books_collection.count_documents({})}")
+        print(f" Total books in database: {existing_count + inserted}")
         
     except Exception as e:
         print(f" Error during seeding: {e}")
@@ -213,4 +128,10 @@ if __name__ == "__main__":
      Library Management System - Book Seeding Script
     """)
     
-    asyncio.run(seed_books())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the books collection with sample data.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--force", action="store_true", help="seed even if books already exist")
+    group.add_argument("--skip-if-exists", action="store_true", help="do nothing if books already exist")
+    args = parser.parse_args()
+    
+    seed_books(force=True if args.force else (False if args.skip_if_exists else None))
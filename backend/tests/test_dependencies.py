@@ -0,0 +1,137 @@
+import asyncio
+import unittest
+from datetime import datetime, timezone
+from time import monotonic
+from unittest import mock
+
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.routers.users import update_user_profile
+from app.schemas.user_schema import UpdateProfileRequest, UserResponse
+from app.utils.cache import token_cache, user_cache
+from app.utils.dependencies import get_current_user
+
+
+class _RaisingAuthService:
+    """Stand-in whose user lookup fails the way AuthService.get_user_by_id does."""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    async def get_user_by_id(self, user_id):
+        raise HTTPException(status_code=self.status_code, detail="lookup failed")
+
+
+class GetCurrentUserErrorTests(unittest.TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        user_cache.clear()
+
+    def _authenticate(self, sub, auth_service):
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=create_access_token({"sub": sub})
+        )
+        return asyncio.run(get_current_user(credentials, auth_service))
+
+    def test_malformed_sub_is_unauthenticated(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self._authenticate("not-an-object-id", _RaisingAuthService(400))
+        self.assertEqual(ctx.exception.status_code, 401)
+        self.assertEqual(ctx.exception.headers["WWW-Authenticate"], "Bearer")
+
+    def test_deleted_user_is_unauthenticated(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self._authenticate("0123456789abcdef01234567", _RaisingAuthService(404))
+        self.assertEqual(ctx.exception.status_code, 401)
+
+    def test_other_lookup_errors_propagate(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self._authenticate("0123456789abcdef01234567", _RaisingAuthService(503))
+        self.assertEqual(ctx.exception.status_code, 503)
+
+
+class _FakeUsersCollection:
+    """Users collection holding one profile, shared by every "worker"."""
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    async def find_one_and_update(self, filter, update, **kwargs):
+        self.doc.update(update["$set"])
+        return dict(self.doc)
+
+
+class _FakeDB:
+    def __init__(self, doc):
+        self.users = _FakeUsersCollection(doc)
+
+
+class _StoredUserAuthService:
+    """Looks users up in the fake collection, counting each lookup."""
+
+    def __init__(self, db):
+        self.db = db
+        self.lookups = 0
+
+    async def get_user_by_id(self, user_id):
+        self.lookups += 1
+        doc = self.db.users.doc
+        return UserResponse.model_construct(
+            id=str(doc["_id"]),
+            name=doc["name"],
+            email=doc["email"],
+            bio=doc.get("bio"),
+            profile_picture=doc.get("profile_picture"),
+            is_verified=doc.get("is_verified", False),
+            created_at=doc["created_at"],
+            is_active=doc.get("is_active", True)
+        )
+
+
+class UserCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        user_cache.clear()
+        self.user_id = ObjectId()
+        self.db = _FakeDB({
+            "_id": self.user_id,
+            "name": "Ann",
+            "email": "ann@gmail.com",
+            "is_verified": True,
+            "created_at": datetime.now(timezone.utc),
+        })
+        self.auth_service = _StoredUserAuthService(self.db)
+        self.credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=create_access_token({"sub": str(self.user_id)})
+        )
+
+    def _me(self):
+        return asyncio.run(get_current_user(self.credentials, self.auth_service))
+
+    def test_profile_update_is_visible_on_next_request(self):
+        user = self._me()
+        asyncio.run(update_user_profile(UpdateProfileRequest(bio="Reads a lot"), user, self.db))
+        self.assertEqual(self._me().bio, "Reads a lot")
+        self.assertEqual(self.auth_service.lookups, 1)
+
+    def test_change_from_another_worker_is_visible_after_ttl(self):
+        self._me()
+        # Another worker deactivates the account; this worker's cache never hears of it
+        self.db.users.doc["is_active"] = False
+        later = monotonic() + settings.USER_CACHE_TTL_SECONDS
+        with mock.patch("app.utils.cache.monotonic", return_value=later):
+            with self.assertRaises(HTTPException) as ctx:
+                self._me()
+        self.assertEqual(ctx.exception.status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
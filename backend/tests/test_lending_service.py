@@ -0,0 +1,163 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from bson import ObjectId
+
+from app.services.lending_service import LendingService
+
+TODAY = datetime(2026, 3, 10)
+
+
+def _resolve(expr, doc):
+    """Evaluate the aggregation expressions the dashboard pipeline uses, the way MongoDB does."""
+    if isinstance(expr, dict):
+        if len(expr) == 1 and next(iter(expr)).startswith("$"):
+            (op, arg), = expr.items()
+            if op == "$toString":
+                return str(_resolve(arg, doc))
+            if op == "$toObjectId":
+                return ObjectId(_resolve(arg, doc))
+            if op == "$ifNull":
+                value, default = (_resolve(a, doc) for a in arg)
+                return default if value is None else value
+            raise AssertionError(f"unsupported operator {op}")
+        return {k: _resolve(v, doc) for k, v in expr.items()}
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = doc
+        for part in expr[1:].split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+    return expr
+
+
+def _run(pipeline, docs, db):
+    """Apply the stages the dashboard pipeline uses to a list of documents."""
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == "$match":
+            docs = [d for d in docs if all(d.get(k) == v for k, v in spec.items())]
+        elif name == "$addFields":
+            docs = [{**d, **{k: _resolve(v, d) for k, v in spec.items()}} for d in docs]
+        elif name == "$lookup":
+            foreign = db[spec["from"]].docs
+            docs = [
+                {**d, spec["as"]: [f for f in foreign if f[spec["foreignField"]] == d[spec["localField"]]]}
+                for d in docs
+            ]
+        elif name == "$unwind":
+            field = spec[1:]
+            docs = [{**d, field: item} for d in docs for item in d[field]]
+        elif name == "$project":
+            docs = [{k: _resolve(v, d) for k, v in spec.items() if v != 0} for d in docs]
+        elif name == "$count":
+            docs = [{spec: len(docs)}] if docs else []
+        elif name == "$facet":
+            docs = [{key: _run(arm, docs, db) for key, arm in spec.items()}]
+        else:
+            raise AssertionError(f"unsupported stage {name}")
+    return docs
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class _FakeCollection:
+    def __init__(self, db, docs):
+        self.db = db
+        self.docs = docs
+
+    def aggregate(self, pipeline):
+        return _FakeCursor(_run(pipeline, self.docs, self.db))
+
+
+class _FakeDB(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+class DashboardTests(unittest.TestCase):
+
+    def setUp(self):
+        self.db = _FakeDB()
+        self.book = {
+            "_id": ObjectId(),
+            "title": "Dune",
+            "author": "Frank Herbert",
+            "genre": "Science Fiction",
+            "total_copies": 2,
+            "available_copies": 0,
+        }
+        self.db["books"] = _FakeCollection(self.db, [self.book])
+        self.db["lendings"] = _FakeCollection(self.db, [])
+        self.service = LendingService(self.db)
+
+    def _lend(self, status, start_offset, end_offset, user_id="u1", book_id=None):
+        self.db["lendings"].docs.append({
+            "_id": ObjectId(),
+            "user_id": user_id,
+            "book_id": book_id or str(self.book["_id"]),
+            "status": status,
+            "lend_start_date": TODAY + timedelta(days=start_offset),
+            "lend_end_date": TODAY + timedelta(days=end_offset),
+            "actual_return_date": None,
+            "created_at": TODAY,
+        })
+
+    def _dashboard(self):
+        with mock.patch("app.services.lending_service._today", return_value=TODAY):
+            return asyncio.run(self.service.get_user_dashboard("u1"))
+
+    def test_lendings_are_bucketed_by_status(self):
+        self._lend("active", -2, 3)
+        self._lend("reserved", 5, 10)
+        self._lend("returned", -20, -15)
+        self._lend("active", 0, 5, user_id="u2")
+
+        dashboard = self._dashboard()
+
+        self.assertEqual(len(dashboard["active_lendings"]), 1)
+        self.assertEqual(len(dashboard["reserved_lendings"]), 1)
+        self.assertEqual(len(dashboard["lending_history"]), 1)
+        self.assertEqual(dashboard["active_lendings"][0]["book"]["title"], "Dune")
+        self.assertEqual(dashboard["reserved_lendings"][0]["days_remaining"], 10)
+        self.assertEqual(dashboard["total_books_borrowed"], 3)
+
+    def test_total_counts_lendings_whose_book_is_gone(self):
+        self._lend("active", -2, 3)
+        self._lend("returned", -20, -15, book_id=str(ObjectId()))
+
+        dashboard = self._dashboard()
+
+        self.assertEqual(dashboard["lending_history"], [])
+        self.assertEqual(dashboard["total_books_borrowed"], 2)
+
+    def test_only_past_due_active_lendings_are_overdue(self):
+        self._lend("active", -8, -1)
+        self._lend("active", -5, 0)
+        self._lend("returned", -20, -15)
+
+        dashboard = self._dashboard()
+
+        late, due_today = sorted(dashboard["active_lendings"], key=lambda l: l["lend_end_date"])
+        self.assertTrue(late["is_overdue"])
+        self.assertIsNone(late["days_remaining"])
+        self.assertFalse(due_today["is_overdue"])
+        self.assertEqual(due_today["days_remaining"], 0)
+        self.assertFalse(dashboard["lending_history"][0]["is_overdue"])
+
+    def test_no_lendings(self):
+        dashboard = self._dashboard()
+
+        self.assertEqual(dashboard["active_lendings"], [])
+        self.assertEqual(dashboard["total_books_borrowed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
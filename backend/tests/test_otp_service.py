@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+from fastapi import HTTPException
+
+from app.models.otp_model import OTPPurpose
+from app.services.otp_service import OTPService
+from app.utils.time_utils import utc_now
+
+
+def _resolve(expr, doc):
+    """Evaluate the aggregation expressions verify_otp uses, the way MongoDB does."""
+    if isinstance(expr, dict):
+        (op, arg), = expr.items()
+        if op == "$literal":
+            return arg
+        if op == "$add":
+            return sum(_resolve(a, doc) for a in arg)
+        if op == "$eq":
+            left, right = (_resolve(a, doc) for a in arg)
+            return left == right
+        raise AssertionError(f"unsupported operator {op}")
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc[expr[1:]]
+    return expr
+
+
+class _FakeOTPCollection:
+    """Single-document stand-in for the otps collection."""
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    async def find_one_and_update(self, filter, pipeline, **kwargs):
+        doc = self.doc
+        if (
+            doc["is_used"]
+            or doc["expires_at"] < filter["expires_at"]["$gte"]
+            or doc["attempts"] >= filter["attempts"]["$lt"]
+        ):
+            return None
+        for stage in pipeline:
+            updates = {k: _resolve(v, doc) for k, v in stage["$set"].items()}
+            doc.update(updates)
+        return dict(doc)
+
+    async def find_one(self, *args, **kwargs):
+        return None if self.doc["is_used"] else dict(self.doc)
+
+    async def update_one(self, filter, update):
+        self.doc.update(update["$set"])
+
+
+class _FakeDB:
+    def __init__(self, doc):
+        self.otps = _FakeOTPCollection(doc)
+
+
+class VerifyOTPTests(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = {
+            "_id": 1,
+            "email": "ann@gmail.com",
+            "otp_code": "123456",
+            "purpose": OTPPurpose.EMAIL_VERIFICATION.value,
+            "expires_at": utc_now() + timedelta(minutes=10),
+            "is_used": False,
+            "attempts": 0,
+        }
+        self.service = OTPService(_FakeDB(self.doc))
+
+    def _verify(self, code):
+        return asyncio.run(
+            self.service.verify_otp("ann@gmail.com", code, OTPPurpose.EMAIL_VERIFICATION)
+        )
+
+    def test_field_path_code_is_rejected(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self._verify("$otp_code")
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertFalse(self.doc["is_used"])
+        self.assertEqual(self.doc["attempts"], 1)
+
+    def test_correct_code_is_accepted(self):
+        self.assertTrue(self._verify("123456"))
+        self.assertTrue(self.doc["is_used"])
+
+    def test_expired_code_reports_expiry(self):
+        self.doc["expires_at"] = utc_now() - timedelta(seconds=1)
+        with self.assertRaises(HTTPException) as ctx:
+            self._verify("123456")
+        self.assertEqual(ctx.exception.detail, "OTP has expired. Please request a new OTP.")
+        self.assertEqual(self.doc["attempts"], 0)
+
+    def test_exhausted_attempts_lock_the_code(self):
+        for _ in range(3):
+            with self.assertRaises(HTTPException):
+                self._verify("000000")
+        with self.assertRaises(HTTPException) as ctx:
+            self._verify("123456")
+        self.assertEqual(
+            ctx.exception.detail, "Too many failed attempts. Please request a new OTP."
+        )
+        self.assertTrue(self.doc["is_used"])
+        self.assertEqual(self.doc["attempts"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()